@@ -26,6 +26,14 @@ UNDO_WINDOW_SECONDS = 30
 # Backup retention in seconds
 BACKUP_RETENTION_SECONDS = 300  # 5 minutes
 
+# Recent chat messages sent with each request (older turns are dropped)
+MAX_HISTORY_MESSAGES = 12
+
+# Models: requests that may call tools use the routing model, history summaries the response model
+# Override with FOLDERLY_ROUTING_MODEL / FOLDERLY_RESPONSE_MODEL, e.g. a faster routing model
+ROUTING_MODEL = os.getenv("FOLDERLY_ROUTING_MODEL", "gpt-4o")
+RESPONSE_MODEL = os.getenv("FOLDERLY_RESPONSE_MODEL", "gpt-4o-mini")
+
 # ============================================================================
 # SECURITY NOTES:
 # ============================================================================
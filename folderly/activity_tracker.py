@@ -6,90 +6,338 @@ Monitors user file activities in the background
 
 import json
 import os
+import glob
+import gzip
+import mmap
+import sys
+import time
+import atexit
+import queue
+import bisect
+import threading
+from array import array
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
-from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
 
-class FolderlyActivityTracker(FileSystemEventHandler):
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import PatternMatchingEventHandler
+except ImportError:
+    # Without the "activity" extra the saved log still loads; only live monitoring is off
+    Observer = None
+
+    class PatternMatchingEventHandler:
+        def __init__(self, *args, **kwargs):
+            pass
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Events are appended in batches: after this many, or once this much time has passed
+FLUSH_EVERY_EVENTS = 64
+FLUSH_INTERVAL_SECONDS = 2.0
+
+# Each path logs at most one event per action in this window; this also collapses
+# the burst of modified events editors and indexers fire for a single save
+EVENT_RATE_LIMIT_SECONDS = 1.0
+EVENT_RATE_GC_SECONDS = 60.0
+
+# One JSON object per line, so new events are appended instead of rewriting the log
+LOG_FILE = "folderly_activities.jsonl"
+LEGACY_LOG_FILE = "folderly_activities.json"
+
+# Past this size the live log is moved aside as a compressed shard (zstd, else gzip)
+ROTATE_LOG_BYTES = 1 << 20
+SHARD_SUFFIX = ".zst" if zstandard else ".gz"
+
+def encode_activity(activity: Dict[str, Any]) -> bytes:
+    """Serialize one activity as a log line"""
+    if orjson:
+        return orjson.dumps(activity) + b"\n"
+    return json.dumps(activity, separators=(",", ":")).encode("utf-8") + b"\n"
+
+def decode_activity(line: bytes) -> Dict[str, Any]:
+    """Parse one log line"""
+    if orjson:
+        return orjson.loads(line)
+    return json.loads(line)
+
+def compress_shard(data: bytes) -> bytes:
+    """Compress a rotated log shard"""
+    if zstandard:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data)
+
+def read_shard(path: str) -> bytes:
+    """Return the NDJSON content of a shard, compressed or not"""
+    with open(path, 'rb') as f:
+        if path.endswith(".zst"):
+            return zstandard.ZstdDecompressor().stream_reader(f).read()
+        if path.endswith(".gz"):
+            return gzip.decompress(f.read())
+        return f.read()
+
+# Logged action -> key it is counted under in get_activity_summary
+SUMMARY_KEYS = {
+    "file_created": "files_created",
+    "file_deleted": "files_deleted",
+    "file_modified": "files_modified",
+    "file_moved": "files_moved",
+    "folder_created": "folders_created",
+    "folder_deleted": "folders_deleted",
+    "folder_modified": "folders_modified",
+    "folder_moved": "folders_moved"
+}
+
+# Logged action -> how show_activity_summary prints it
+ACTIVITY_FORMATS = {
+    "file_created": "{time} 📄 Created file: {filename}",
+    "folder_created": "{time} 📁 Created folder: {filename}",
+    "file_deleted": "{time} 🗑️ Deleted file: {filename}",
+    "folder_deleted": "{time} 🗑️ Deleted folder: {filename}",
+    "file_modified": "{time} ✏️ Modified file: {filename}",
+    "folder_modified": "{time} ✏️ Modified folder: {filename}",
+    "file_moved": "{time} 📦 Moved file: {old_name} → {new_name}",
+    "folder_moved": "{time} 📦 Moved folder: {old_name} → {new_name}"
+}
+
+# Files/folders to ignore (case-insensitive substrings of the name)
+IGNORED_NAMES = [
+    "thumbs.db",
+    ".ds_store",
+    "desktop.ini",
+    "~$",  # Temporary files
+    ".tmp",
+    ".temp",
+    ".log",
+    ".cache",
+    "node_modules",
+    ".git",
+    ".vscode",
+    "__pycache__",
+    ".pytest_cache",
+    ".coverage",
+    ".env",
+    ".venv",
+    "venv",
+    "env"
+]
+
+def should_ignore(filename: str) -> bool:
+    """Check if file/folder should be ignored"""
+    filename_lower = filename.lower()
+    return any(name in filename_lower for name in IGNORED_NAMES)
+
+class FolderlyActivityTracker(PatternMatchingEventHandler):
     """Tracks user file activities for Folderly"""
     
     def __init__(self, desktop_path: str = None):
+        # watchdog drops ignored names before any on_* callback runs
+        super().__init__(
+            ignore_patterns=[f"*{name}*" for name in IGNORED_NAMES],
+            case_sensitive=False
+        )
         self.desktop_path = desktop_path or str(Path.home() / "Desktop")
         self.activities = []
-        self.log_file = "folderly_activities.json"
+        # The sorted '_ts' floats of self.activities, so time lookups bisect instead of scanning
+        self._ts_index = array('d')
+        self.log_file = LOG_FILE
         
-        # Files/folders to ignore (case-insensitive)
-        self.ignore_patterns = [
-            "thumbs.db",
-            ".ds_store",
-            "desktop.ini",
-            "~$",  # Temporary files
-            ".tmp",
-            ".temp",
-            ".log",
-            ".cache",
-            "node_modules",
-            ".git",
-            ".vscode",
-            "__pycache__",
-            ".pytest_cache",
-            ".coverage",
-            ".env",
-            ".venv",
-            "venv",
-            "env"
-        ]
+        # Pending writes: watchdog calls back from its own thread
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._flush_timer = None
         
         self.load_activities()
-    
-    def should_ignore(self, filename: str) -> bool:
-        """Check if file/folder should be ignored"""
-        filename_lower = filename.lower()
         
-        for pattern in self.ignore_patterns:
-            if pattern in filename_lower:
-                return True
+        # (path, action) -> when an event for it was last let through
+        self._last_event_at = {}
+        self._last_event_gc = time.monotonic()
         
-        return False
+        # watchdog's thread only enqueues; a worker, started with the first event, stores them
+        self._events = queue.SimpleQueue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
     
     def load_activities(self):
-        """Load existing activities from file"""
+        """Load existing activities from the rotated shards and the live log"""
         try:
-            if os.path.exists(self.log_file):
-                with open(self.log_file, 'r') as f:
-                    self.activities = json.load(f)
+            shards = self._shard_files()
+            if os.path.exists(self.log_file) or shards:
+                activities = []
+                for shard in shards:
+                    self._parse_lines(read_shard(shard).splitlines(), activities)
+                    if shard.endswith(".jsonl"):
+                        # Moved aside but never compressed, e.g. the process exited first
+                        threading.Thread(target=self._compress_shard, args=(shard,), daemon=True).start()
+                
+                damaged = False
+                if os.path.exists(self.log_file) and os.path.getsize(self.log_file):
+                    # Map the log and hand each raw line to the parser, no text decoding
+                    with open(self.log_file, 'rb') as f, \
+                            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        damaged = self._parse_lines(iter(mapped.readline, b""), activities)
+                self.activities = activities
+                self._index_timestamps()
+                if damaged:
+                    self.save_activities()
+            elif os.path.exists(LEGACY_LOG_FILE):
+                # Carry over the old single-document log once
+                with open(LEGACY_LOG_FILE, 'rb') as f:
+                    self.activities = decode_activity(f.read())
+                self._index_timestamps()
+                self.save_activities()
         except Exception as e:
             print(f"Could not load activities: {e}")
             self.activities = []
+            self._ts_index = array('d')
+    
+    @staticmethod
+    def _parse_lines(lines, activities: List[Dict]) -> bool:
+        """Decode log lines into activities; returns True if any line was damaged"""
+        damaged = False
+        for line in lines:
+            try:
+                activities.append(decode_activity(line))
+            except ValueError:
+                damaged = True  # Half-written line from an interrupted run
+        return damaged
+    
+    def _shard_files(self, all_copies: bool = False) -> List[str]:
+        """Rotated shards of the log, oldest first, preferring compressed copies"""
+        stem = os.path.splitext(self.log_file)[0]
+        shards = {}
+        copies = []
+        for path in glob.glob(f"{glob.escape(stem)}.*.jsonl*"):
+            stamp, _, suffix = path[len(stem) + 1:].partition(".")
+            if not stamp.isdigit() or suffix.endswith(".tmp"):
+                continue
+            copies.append(path)
+            if stamp not in shards or suffix != "jsonl":
+                shards[stamp] = path
+        if all_copies:
+            return copies
+        return [shards[stamp] for stamp in sorted(shards, key=int)]
+    
+    def _rotate_log(self):
+        """Move the full live log aside and compress it in the background; needs _save_lock"""
+        stem = os.path.splitext(self.log_file)[0]
+        shard = f"{stem}.{time.time_ns()}.jsonl"
+        os.replace(self.log_file, shard)
+        threading.Thread(target=self._compress_shard, args=(shard,), daemon=True).start()
+    
+    def _compress_shard(self, shard: str):
+        """Replace a rotated plain shard with its compressed copy"""
+        target = shard + SHARD_SUFFIX
+        tmp_file = f"{target}.tmp"
+        try:
+            with open(shard, 'rb') as f:
+                data = compress_shard(f.read())
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            with self._save_lock:
+                # A full rewrite may have folded this shard back into the live log meanwhile
+                if os.path.exists(shard):
+                    os.replace(tmp_file, target)
+                    os.remove(shard)
+                else:
+                    os.remove(tmp_file)
+        except Exception as e:
+            print(f"Could not compress activity log: {e}")
+    
+    def _index_timestamps(self):
+        """Fill in '_ts' for entries logged with ISO timestamps and rebuild the time index"""
+        for activity in self.activities:
+            if "_ts" not in activity:
+                activity["_ts"] = datetime.fromisoformat(activity["timestamp"]).timestamp()
+            # Parsed lines bring fresh copies of the same few names; share one of each
+            activity["action"] = sys.intern(activity["action"])
+            activity["details"] = {sys.intern(key): value for key, value in activity["details"].items()}
+        self.activities.sort(key=lambda activity: activity["_ts"])
+        self._ts_index = array('d', (activity["_ts"] for activity in self.activities))
     
     def save_activities(self):
-        """Save activities to file"""
+        """Rewrite the whole log atomically, e.g. after dropping old activities"""
+        tmp_file = f"{self.log_file}.tmp"
+        try:
+            with self._save_lock:
+                with self._lock:
+                    activities = list(self.activities)
+                    self._pending = []
+                    self._last_flush = time.monotonic()
+                
+                with open(tmp_file, 'wb') as f:
+                    f.write(b"".join(map(encode_activity, activities)))
+                os.replace(tmp_file, self.log_file)
+                
+                # Everything now lives in the rewritten log
+                for shard in self._shard_files(all_copies=True):
+                    os.remove(shard)
+        except Exception as e:
+            print(f"Could not save activities: {e}")
+    
+    def flush(self):
+        """Append pending activities to the log, if there are any"""
         try:
-            with open(self.log_file, 'w') as f:
-                json.dump(self.activities, f, indent=2)
+            with self._save_lock:
+                with self._lock:
+                    self._flush_timer = None
+                    pending, self._pending = self._pending, []
+                    self._last_flush = time.monotonic()
+                
+                if pending:
+                    with open(self.log_file, 'ab') as f:
+                        f.write(b"".join(map(encode_activity, pending)))
+                        log_size = f.tell()
+                    if log_size >= ROTATE_LOG_BYTES:
+                        self._rotate_log()
         except Exception as e:
             print(f"Could not save activities: {e}")
     
     def add_activity(self, action: str, details: Dict[str, Any]):
-        """Add a new activity"""
+        """Add a new activity; the log is appended to in batches, not per event"""
+        # The epoch float is the only timestamp; it is formatted only for display
+        now_ts = time.time()
+        action = sys.intern(action)
         activity = {
-            "timestamp": datetime.now().isoformat(),
+            "_ts": now_ts,
             "action": action,
             "details": details
         }
-        self.activities.append(activity)
-        self.save_activities()
+        with self._lock:
+            self.activities.append(activity)
+            self._ts_index.append(now_ts)
+            self._pending.append(activity)
+            flush_now = (len(self._pending) >= FLUSH_EVERY_EVENTS
+                         or time.monotonic() - self._last_flush > FLUSH_INTERVAL_SECONDS)
+            if not flush_now and self._flush_timer is None:
+                # Pick up the tail of a burst once it goes quiet
+                self._flush_timer = threading.Timer(FLUSH_INTERVAL_SECONDS, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if flush_now:
+            self.flush()
     
     def on_created(self, event):
+        if not self._over_rate_limit(event.src_path, "created"):
+            self._enqueue(self._record_created, event)
+    
+    def _record_created(self, event):
         """Track file and folder creation"""
         filename = os.path.basename(event.src_path)
         
-        # Skip if file/folder should be ignored
-        if self.should_ignore(filename):
-            return
-            
         item_type = "folder" if event.is_directory else "file"
         self.add_activity(f"{item_type}_created", {
             "filename": filename,
@@ -98,13 +346,13 @@ class FolderlyActivityTracker(FileSystemEventHandler):
         })
     
     def on_deleted(self, event):
+        if not self._over_rate_limit(event.src_path, "deleted"):
+            self._enqueue(self._record_deleted, event)
+    
+    def _record_deleted(self, event):
         """Track file and folder deletion"""
         filename = os.path.basename(event.src_path)
         
-        # Skip if file/folder should be ignored
-        if self.should_ignore(filename):
-            return
-            
         item_type = "folder" if event.is_directory else "file"
         self.add_activity(f"{item_type}_deleted", {
             "filename": filename,
@@ -113,13 +361,13 @@ class FolderlyActivityTracker(FileSystemEventHandler):
         })
     
     def on_modified(self, event):
+        if not self._over_rate_limit(event.src_path, "modified"):
+            self._enqueue(self._record_modified, event)
+    
+    def _record_modified(self, event):
         """Track file and folder modification"""
         filename = os.path.basename(event.src_path)
         
-        # Skip if file/folder should be ignored
-        if self.should_ignore(filename):
-            return
-            
         item_type = "folder" if event.is_directory else "file"
         self.add_activity(f"{item_type}_modified", {
             "filename": filename,
@@ -128,14 +376,18 @@ class FolderlyActivityTracker(FileSystemEventHandler):
         })
     
     def on_moved(self, event):
+        if not self._over_rate_limit(event.src_path, "moved"):
+            self._enqueue(self._record_moved, event)
+    
+    def _record_moved(self, event):
         """Track file and folder movement"""
         old_name = os.path.basename(event.src_path)
         new_name = os.path.basename(event.dest_path)
         
-        # Skip if either old or new name should be ignored
-        if self.should_ignore(old_name) or self.should_ignore(new_name):
+        # watchdog lets a move through when either side matches, so check both ends
+        if should_ignore(old_name) or should_ignore(new_name):
             return
-            
+        
         item_type = "folder" if event.is_directory else "file"
         self.add_activity(f"{item_type}_moved", {
             "old_name": old_name,
@@ -145,57 +397,126 @@ class FolderlyActivityTracker(FileSystemEventHandler):
             "type": item_type
         })
     
+    def _over_rate_limit(self, path: str, action: str) -> bool:
+        """Let through at most one event per path and action each second; observer thread only
+
+        This is the on_modified dedupe: a save's burst of modified events shares one key,
+        so no (path, mtime, size) fingerprint or extra stat is needed.
+        """
+        now = time.monotonic()
+        key = (path, action)
+        if now - self._last_event_at.get(key, float("-inf")) < EVENT_RATE_LIMIT_SECONDS:
+            return True
+        self._last_event_at[key] = now
+        
+        # Forget quiet paths now and then so the table stays small
+        if now - self._last_event_gc > EVENT_RATE_GC_SECONDS:
+            self._last_event_gc = now
+            self._last_event_at = {
+                key: seen for key, seen in self._last_event_at.items()
+                if now - seen < EVENT_RATE_LIMIT_SECONDS
+            }
+        return False
+    
+    def _enqueue(self, record, event):
+        """Hand an event to the worker, starting it (and its exit hook) only once"""
+        if self._worker is None:
+            with self._worker_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._process_events, daemon=True)
+                    self._worker.start()
+                    atexit.register(self.stop)
+        self._events.put((record, event))
+    
+    def stop(self):
+        """Record what is still queued, write it out and end the worker; also runs at exit"""
+        with self._worker_lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            atexit.unregister(self.stop)
+            # The worker finishes everything queued before the sentinel, then returns
+            self._events.put((None, None))
+            worker.join(timeout=5.0)
+        self._drain_events()
+    
+    def _process_events(self):
+        """Worker loop: record queued watchdog events off the observer thread"""
+        while True:
+            record, event = self._events.get()
+            if record is None:
+                return
+            try:
+                record(event)
+            except Exception as e:
+                print(f"Could not record activity: {e}")
+    
+    def _drain_events(self):
+        """Record whatever is still queued, then write it out"""
+        while True:
+            try:
+                record, event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if record is not None:
+                record(event)
+        self.flush()
+    
+    def _recent_start(self, hours: int) -> int:
+        """Index of the first activity within the last N hours"""
+        return bisect.bisect_left(self._ts_index, time.time() - (hours * 3600))
+    
     def get_recent_activities(self, hours: int = 24) -> List[Dict]:
         """Get activities from the last N hours"""
-        cutoff = datetime.now().timestamp() - (hours * 3600)
-        recent = []
-        
-        for activity in self.activities:
-            activity_time = datetime.fromisoformat(activity["timestamp"]).timestamp()
-            if activity_time >= cutoff:
-                recent.append(activity)
-        
-        return recent
+        return self.activities[self._recent_start(hours):]
     
     def get_activity_summary(self, hours: int = 24) -> Dict[str, int]:
         """Get summary of activities"""
-        recent = self.get_recent_activities(hours)
-        summary = {
-            "files_created": 0,
-            "files_deleted": 0,
-            "files_modified": 0,
-            "files_moved": 0,
-            "folders_created": 0,
-            "folders_deleted": 0,
-            "folders_modified": 0,
-            "folders_moved": 0
-        }
-        
-        for activity in recent:
-            action = activity["action"]
-            if action in summary:
-                summary[action] += 1
-        
-        return summary
+        counts = Counter(activity["action"] for activity in self.get_recent_activities(hours))
+        return {summary_key: counts[action] for action, summary_key in SUMMARY_KEYS.items()}
     
     def clear_old_activities(self, days: int = 7):
         """Clear activities older than N days"""
-        cutoff = datetime.now().timestamp() - (days * 24 * 3600)
-        self.activities = [
-            activity for activity in self.activities
-            if datetime.fromisoformat(activity["timestamp"]).timestamp() >= cutoff
-        ]
+        cutoff = time.time() - (days * 24 * 3600)
+        with self._lock:
+            start = bisect.bisect_left(self._ts_index, cutoff)
+            del self.activities[:start]
+            del self._ts_index[:start]
         self.save_activities()
 
+# One observer thread serves every tracker; watches on the same folder share an emitter
+_observer = None
+_observer_lock = threading.Lock()
+
+def get_observer() -> Observer:
+    """Return the shared observer, starting it on first use"""
+    global _observer
+    with _observer_lock:
+        if _observer is None:
+            _observer = Observer()
+            _observer.start()
+    return _observer
+
 def start_activity_monitoring(desktop_path: str = None) -> FolderlyActivityTracker:
     """Start monitoring desktop activities"""
     tracker = FolderlyActivityTracker(desktop_path)
-    observer = Observer()
+    if Observer is None:
+        print('Live activity monitoring needs watchdog: pip install "folderly[activity]"')
+        return tracker, None
+    observer = get_observer()
     observer.schedule(tracker, tracker.desktop_path, recursive=False)
-    observer.start()
     
     return tracker, observer
 
+# The tracker started on first use and shared by every later activity request
+_background_tracker = None
+
+def get_background_tracker(desktop_path: str = None) -> FolderlyActivityTracker:
+    """Return the running tracker, starting monitoring the first time it is needed"""
+    global _background_tracker
+    if _background_tracker is None:
+        _background_tracker, _ = start_activity_monitoring(desktop_path)
+    return _background_tracker
+
 def show_activity_summary(tracker: FolderlyActivityTracker):
     """Show user's recent activity summary - returns data instead of printing"""
     summary = tracker.get_activity_summary()
@@ -212,26 +533,13 @@ def show_activity_summary(tracker: FolderlyActivityTracker):
     # Format activities for return
     formatted_activities = []
     for activity in recent_activities[-10:]:  # Last 10 activities
-        timestamp = datetime.fromisoformat(activity["timestamp"]).strftime("%H:%M")
+        timestamp = datetime.fromtimestamp(activity["_ts"]).strftime("%H:%M")
         action = activity["action"]
         details = activity["details"]
         
-        if action == "file_created":
-            formatted_activities.append(f"{timestamp} 📄 Created file: {details['filename']}")
-        elif action == "folder_created":
-            formatted_activities.append(f"{timestamp} 📁 Created folder: {details['filename']}")
-        elif action == "file_deleted":
-            formatted_activities.append(f"{timestamp} 🗑️ Deleted file: {details['filename']}")
-        elif action == "folder_deleted":
-            formatted_activities.append(f"{timestamp} 🗑️ Deleted folder: {details['filename']}")
-        elif action == "file_modified":
-            formatted_activities.append(f"{timestamp} ✏️ Modified file: {details['filename']}")
-        elif action == "folder_modified":
-            formatted_activities.append(f"{timestamp} ✏️ Modified folder: {details['filename']}")
-        elif action == "file_moved":
-            formatted_activities.append(f"{timestamp} 📦 Moved file: {details['old_name']} → {details['new_name']}")
-        elif action == "folder_moved":
-            formatted_activities.append(f"{timestamp} 📦 Moved folder: {details['old_name']} → {details['new_name']}")
+        line_format = ACTIVITY_FORMATS.get(action)
+        if line_format:
+            formatted_activities.append(line_format.format(time=timestamp, **details))
     
     return {
         "success": True,
@@ -4,7 +4,7 @@ AI Integration with Activity Tracker
 Analyzes user file activity patterns and provides insights
 """
 
-from folderly.activity_tracker import FolderlyActivityTracker, show_activity_summary
+from folderly.activity_tracker import FolderlyActivityTracker, get_background_tracker, show_activity_summary
 from datetime import datetime
 
 def analyze_activity_with_ai(tracker: FolderlyActivityTracker):
@@ -19,7 +19,7 @@ def analyze_activity_with_ai(tracker: FolderlyActivityTracker):
     # Prepare activity summary for AI
     activity_summary = []
     for activity in activities:
-        timestamp = datetime.fromisoformat(activity["timestamp"]).strftime("%H:%M")
+        timestamp = datetime.fromtimestamp(activity["_ts"]).strftime("%H:%M")
         action = activity["action"]
         details = activity["details"]
         
@@ -93,9 +93,12 @@ def suggest_ai_actions(tracker: FolderlyActivityTracker):
         "message": f"Found {len(suggestions)} suggestions"
     }
 
-def show_ai_enhanced_activity(tracker: FolderlyActivityTracker):
+def show_ai_enhanced_activity(tracker: FolderlyActivityTracker = None):
     """Show activity summary with AI insights - returns data instead of printing"""
     
+    # Reuse the background tracker instead of reloading the activity log each call
+    tracker = tracker or get_background_tracker()
+    
     # Get activity summary
     activity_data = show_activity_summary(tracker)
     
@@ -1,47 +1,866 @@
 import os
+import re
+import sys
 import json
-import openai
+import time
+import select
 import asyncio
-from dotenv import load_dotenv
-from src.ai.function_schemas import get_function_schemas
+import logging
+import threading
+from src.ai.function_schemas import get_tool_schemas
+from src.ai.response_cache import ResponseCache
 from src.ai.prompts import (
     load_system_prompt, load_force_prompt, load_welcome_message, 
-    load_goodbye_message, load_empty_input_message, load_error_message
+    load_goodbye_message, load_empty_input_message, load_error_message,
+    load_batch_message, load_result_reply, is_single_step_request, load_history_summary_prompt,
+    load_history_summary_message, read_history_summary, is_history_summary_message
 )
-from src.core.core import list_directory_items, filter_and_sort_by_modified, create_directory, create_multiple_directories, create_numbered_files, move_items_to_directory, delete_single_item, delete_multiple_items, delete_items_by_pattern, list_nested_folders_tree, count_files_by_extension, get_file_type_statistics, copy_multiple_items, rename_multiple_items, discover_user_paths
+from src.core.core import TARGET_FOLDER, get_directory, get_visible_items, list_directory_items, filter_and_sort_by_modified, create_directory, create_multiple_directories, create_numbered_files, move_items_to_directory, delete_single_item, delete_multiple_items, delete_items_by_pattern, list_nested_folders_tree, count_files_by_extension, get_file_type_statistics, copy_multiple_items, rename_multiple_items, discover_user_paths
+from src.core.search import find_duplicates_by_name
 from pathlib import Path
 
-# Load environment variables
-load_dotenv()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Get API key from environment or use the one passed from CLI
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    print(load_error_message("api_key"))
-    exit(1)
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:
+    PromptSession = None
 
-print(f"API Key loaded: {'Yes' if api_key else 'No'}")
+logger = logging.getLogger(__name__)
 
-# Configure OpenAI client - use async client
-client = openai.AsyncOpenAI(api_key=api_key)
+# openai is slow to import, so it loads on first use
+_client = None
+
+# .env is looked up in the working directory first, then the project root
+ENV_FILE_CANDIDATES = (Path(".env"), Path(__file__).resolve().parents[2] / ".env")
+# Like python-dotenv, a '#' after whitespace starts a comment in an unquoted value
+_ENV_INLINE_COMMENT = re.compile(r"\s+#.*$")
+
+def _read_env_file(env_path: Path):
+    """Minimal KEY=value parser; existing environment variables always win"""
+    with open(env_path, encoding="utf-8") as env_file:
+        for line in env_file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("export "):
+                line = line[7:]
+            key, sep, value = line.partition("=")
+            key = key.strip()
+            if not sep or not key:
+                continue
+            value = value.strip()
+            if value[:1] in ("'", '"'):
+                # Quoted values keep '#' and spaces; anything after the closing quote is dropped
+                end = value.find(value[0], 1)
+                value = value[1:end] if end != -1 else value[1:]
+            else:
+                value = _ENV_INLINE_COMMENT.sub("", value)
+            os.environ.setdefault(key, value)
+
+def _load_env():
+    """Return the API key, reading .env only when it is not already set"""
+    api_key = os.environ.get("OPENAI_API_KEY")
+    if api_key is None:
+        for env_path in ENV_FILE_CANDIDATES:
+            if env_path.exists():
+                _read_env_file(env_path)
+                break
+        api_key = os.environ.get("OPENAI_API_KEY")
+    return api_key
+
+def _make_http_client():
+    """Keep-alive pool sized for one long chat session, over HTTP/2 when h2 is installed"""
+    import httpx
+    import openai
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    # openai's subclass keeps its own defaults (redirects etc.) on top of these settings
+    client_class = getattr(openai, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+    return client_class(
+        http2=http2,
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=16, keepalive_expiry=300.0),
+        timeout=httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0)
+    )
+
+def _get_client():
+    """Create the async OpenAI client once, on first use"""
+    global _client
+    if _client is None:
+        import openai
+        _client = openai.AsyncOpenAI(api_key=_load_env(), http_client=_make_http_client())
+    return _client
+
+async def close_client():
+    """Close the client's pooled connections; the next request opens a new client"""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.close()
+
+def __getattr__(name):
+    if name == "client":
+        return _get_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# The prompt and schemas never change during a session, so build and validate them once
+SYSTEM_PROMPT = load_system_prompt()
+TOOL_SCHEMAS = get_tool_schemas()
+TOOL_CHOICE = "auto"
+
+# Every completion that offers tools uses the routing model and its budget, since long
+# argument lists must not be cut off; the cheaper model only writes text-only summaries
+try:
+    from config import ROUTING_MODEL, RESPONSE_MODEL
+except ImportError:
+    ROUTING_MODEL = os.getenv("FOLDERLY_ROUTING_MODEL", "gpt-4o")
+    RESPONSE_MODEL = os.getenv("FOLDERLY_RESPONSE_MODEL", "gpt-4o-mini")
+ROUTING_MAX_TOKENS = 2000
+MAX_ARGUMENT_RETRIES = 2
+# Tool calls cut off by the token limit are retried with a doubled budget, up to this cap
+RETRY_MAX_TOKENS = 8000
+# Streamed tokens are batched into terminal writes at about 30 frames a second
+STREAM_FLUSH_SECONDS = 0.033
+
+# Functions that only read the filesystem, safe to replay from the response cache
+READ_ONLY_FUNCTIONS = {
+    "list_directory_items", "filter_and_sort_by_modified", "list_nested_folders_tree",
+    "count_files_by_extension", "get_file_type_statistics", "discover_user_paths",
+    "find_duplicates_by_name"
+}
+
+response_cache = ResponseCache()
+
+# Bound what each request carries: recent messages and long result lists
+try:
+    from config import MAX_HISTORY_MESSAGES
+except ImportError:
+    MAX_HISTORY_MESSAGES = 12
+MAX_RESULT_LIST_ITEMS = 50
+MAX_RESULT_TEXT_CHARS = 4000
+# Listing and statistics results are re-sent every turn, so they keep fewer entries
+RESULT_LIST_LIMITS = {
+    "list_directory_items": 20,
+    "count_files_by_extension": 20,
+    "get_file_type_statistics": 20,
+    "list_nested_folders_tree": 20
+}
+
+# Messages trimmed from the window are folded into a running summary by the cheaper model
+SUMMARY_MODEL = RESPONSE_MODEL
+SUMMARY_MAX_TOKENS = 200
+SUMMARY_MESSAGE_CHARS = 300
+
+# Lines typed or piped in while a turn runs are answered together in one request
+MAX_BATCHED_INPUTS = 5
+EXIT_COMMANDS = frozenset({'bye', 'goodbye', 'exit', 'quit'})
+# Longer input can't be an exit command, so pasted text skips the lowercase copy
+MAX_EXIT_COMMAND_LENGTH = max(map(len, EXIT_COMMANDS))
+
+# Conversation history is kept between runs so sessions can pick up where they left off
+HISTORY_PATH = Path.home() / ".folderly" / "history.json"
+RESPONSE_CACHE_PATH = Path.home() / ".folderly" / "response_cache.json"
+
+# The default listing is fetched into the read cache while the user types
+USER_PROMPT = "\n💭 You: "
+
+# Path discovery is warmed up in the background and handed to the next discover call
+DISCOVERY_MAX_AGE_SECONDS = 60.0
+
+# Folders compared when the user asks for duplicates without naming any
+DUPLICATE_SEARCH_FOLDERS = ["Desktop", "Downloads", "Documents"]
+_prewarmed_discovery = {"task": None, "started_at": 0.0}
+
+# Read-only results are reused until they expire or any mutating function runs
+READ_CACHE_TTLS = {
+    "list_directory_items": 30.0,
+    "filter_and_sort_by_modified": 30.0,
+    "list_nested_folders_tree": 30.0,
+    "count_files_by_extension": 30.0,
+    "get_file_type_statistics": 30.0,
+    "find_duplicates_by_name": 30.0,
+    # The user's standard folders don't move during a session
+    "discover_user_paths": 3600.0
+}
+READ_CACHE_MAX_ENTRIES = 128
+_read_cache = {"entries": {}, "generation": 0}
+
+def dumps_result(result) -> str:
+    """Serialize a function result compactly for the conversation, Paths included"""
+    if orjson:
+        return orjson.dumps(result, default=str).decode()
+    return json.dumps(result, separators=(",", ":"), default=str)
+
+def compact_result(result, max_items=MAX_RESULT_LIST_ITEMS):
+    """Cut long lists and texts in a function result down before it enters the history"""
+    compacted = dict(result)
+    for key, value in result.items():
+        if isinstance(value, list) and len(value) > max_items:
+            compacted[key] = value[:max_items]
+            compacted[f"{key}_elided"] = f"...{len(value) - max_items} more items elided"
+        elif isinstance(value, str) and len(value) > MAX_RESULT_TEXT_CHARS:
+            compacted[key] = value[:MAX_RESULT_TEXT_CHARS]
+            compacted[f"{key}_elided"] = f"...{len(value) - MAX_RESULT_TEXT_CHARS} more characters elided"
+    return compacted
+
+def history_head(conversation_history):
+    """The system prompt plus the running summary, when there is one"""
+    if len(conversation_history) > 1 and is_history_summary_message(conversation_history[1]):
+        return conversation_history[:2]
+    return conversation_history[:1]
+
+def trim_history(conversation_history):
+    """Keep the system prompt and summary plus the most recent messages, starting at a user turn"""
+    head = history_head(conversation_history)
+    if len(conversation_history) <= MAX_HISTORY_MESSAGES + len(head):
+        return conversation_history
+    
+    recent = conversation_history[-MAX_HISTORY_MESSAGES:]
+    # Never start mid-round: tool messages must follow their assistant tool_calls message
+    for index, message in enumerate(recent):
+        if message["role"] == "user":
+            return head + recent[index:]
+    # One round of tool calls fills the window; a lone tool message or call would be rejected
+    last = conversation_history[-1]
+    if last["role"] == "user" or (last["role"] == "assistant" and not last.get("tool_calls")):
+        return head + [last]
+    return head
+
+async def summarize_history(dropped_messages, previous_summary):
+    """Fold messages leaving the window into the running summary; keeps the old one on failure"""
+    lines = [
+        f"{message['role']}: {str(message['content'])[:SUMMARY_MESSAGE_CHARS]}"
+        for message in dropped_messages if message.get("content")
+    ]
+    if not lines:
+        return previous_summary
+    
+    if previous_summary:
+        lines.insert(0, f"Previous summary: {previous_summary}")
+    try:
+        response = await _get_client().chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": load_history_summary_prompt()},
+                {"role": "user", "content": "\n".join(lines)}
+            ],
+            temperature=0,
+            max_tokens=SUMMARY_MAX_TOKENS
+        )
+        return (response.choices[0].message.content or "").strip() or previous_summary
+    except Exception:
+        # A missing summary only costs context, it must never break the chat
+        return previous_summary
+
+async def fold_summary(conversation_history, summary_task):
+    """Wait for a running summary and put it in place of the previous one"""
+    summary = await summary_task
+    if not summary:
+        return conversation_history
+    head = history_head(conversation_history)
+    return [head[0], load_history_summary_message(summary)] + conversation_history[len(head):]
+
+def load_history():
+    """Load the saved conversation, always under the current system prompt"""
+    history = [{"role": "system", "content": SYSTEM_PROMPT}]
+    try:
+        saved = loads_json(HISTORY_PATH.read_bytes())
+    except (OSError, ValueError):
+        return history
+    
+    if isinstance(saved, list) and all(isinstance(message, dict) for message in saved):
+        history.extend(
+            message for message in saved
+            if message.get("role") != "system" or is_history_summary_message(message)
+        )
+    return trim_history(history)
+
+def save_history(conversation_history):
+    """Write the bounded conversation to disk in compact JSON"""
+    try:
+        HISTORY_PATH.parent.mkdir(parents=True, exist_ok=True)
+        if orjson:
+            data = orjson.dumps(conversation_history)
+        else:
+            data = json.dumps(conversation_history, separators=(",", ":")).encode("utf-8")
+        HISTORY_PATH.write_bytes(data)
+    except OSError:
+        # Losing the saved history is not worth interrupting the chat
+        pass
+
+def is_exit_command(text):
+    """True when the user asked to end the chat"""
+    return len(text) <= MAX_EXIT_COMMAND_LENGTH and text.lower() in EXIT_COMMANDS
+
+class PipedStdin:
+    """Line reader over the raw stdin fd; sys.stdin's text buffer hides already queued lines from select()"""
+    
+    def __init__(self, fd, encoding="utf-8"):
+        self.fd = fd
+        self.encoding = encoding
+        self.pending = bytearray()
+        self.eof = False
+    
+    def _fill(self):
+        chunk = os.read(self.fd, 65536)
+        if chunk:
+            self.pending += chunk
+        else:
+            self.eof = True
+    
+    def _pop_line(self):
+        """Next complete line from the buffer, or the unterminated tail once the pipe is closed"""
+        end = self.pending.find(b"\n") + 1
+        if not end:
+            if not (self.eof and self.pending):
+                return None
+            end = len(self.pending)
+        line = bytes(self.pending[:end])
+        del self.pending[:end]
+        return line.decode(self.encoding, errors="replace").rstrip("\r\n")
+    
+    def readline(self) -> str:
+        """Block until a full line is available; EOFError once the pipe is closed and drained"""
+        while True:
+            line = self._pop_line()
+            if line is not None:
+                return line
+            if self.eof:
+                raise EOFError
+            self._fill()
+    
+    def queued_lines(self, limit: int) -> list:
+        """Lines that arrived already, without waiting for more"""
+        lines = []
+        while len(lines) < limit:
+            line = self._pop_line()
+            if line is None:
+                # select() only supports sockets on Windows, so only buffered lines count there
+                if self.eof or os.name == "nt" or not select.select([self.fd], [], [], 0)[0]:
+                    break
+                self._fill()
+                continue
+            if line.strip():
+                lines.append(line.strip())
+        return lines
+
+_piped_stdin = {"reader": None}
+
+def piped_stdin():
+    """The shared PipedStdin when stdin is a pipe or file, None for a terminal"""
+    if _piped_stdin["reader"] is None:
+        try:
+            if sys.stdin.isatty():
+                return None
+            fd = sys.stdin.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+        _piped_stdin["reader"] = PipedStdin(fd, sys.stdin.encoding or "utf-8")
+    return _piped_stdin["reader"]
+
+def read_stdin_line(prompt):
+    """input() for terminals; piped stdin is read through PipedStdin so queued lines stay visible"""
+    reader = piped_stdin()
+    if reader is None:
+        return input(prompt)
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    return reader.readline()
+
+def read_line_in_thread(prompt):
+    """input() on a daemon thread, so Ctrl-C can cancel the wait and exit leaves no thread to join"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(line, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(line)
+    
+    def read():
+        try:
+            line, error = read_stdin_line(prompt), None
+        except Exception as e:
+            line, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, line, error)
+        except RuntimeError:
+            # The chat already ended and closed its loop
+            pass
+    
+    threading.Thread(target=read, daemon=True).start()
+    return future
+
+def read_queued_lines(limit=MAX_BATCHED_INPUTS - 1):
+    """Collect lines already waiting on stdin without blocking"""
+    reader = piped_stdin()
+    if reader is not None:
+        return reader.queued_lines(limit)
+    # select() only supports sockets on Windows
+    if os.name == "nt":
+        return []
+    
+    # A terminal hands over one line per read, so what select() sees is what is queued
+    
+    lines = []
+    while len(lines) < limit:
+        # Zero timeout: poll only, never add latency to the prompt
+        ready, _, _ = select.select([sys.stdin], [], [], 0)
+        if not ready:
+            break
+        line = sys.stdin.readline()
+        if not line:
+            break
+        if line.strip():
+            lines.append(line.strip())
+    return lines
+
+def loads_json(arguments):
+    """Parse JSON text or bytes, such as streamed function-call arguments"""
+    if orjson:
+        return orjson.loads(arguments)
+    return json.loads(arguments)
 
 def main_sync():
     """Synchronous wrapper for async main function - entry point for Poetry script"""
     asyncio.run(chat_with_ai())
 
+# ============================================================================
+# FUNCTION HANDLERS
+# ============================================================================
+# Each handler takes the parsed tool arguments and returns the function result
+
+def listing_kwargs(args):
+    """Map list_directory_items arguments onto keyword arguments, defaults filled in"""
+    return dict(
+        custom_path=args.get("custom_path"),
+        folder_name=args.get("folder_name") or TARGET_FOLDER,
+        extension=args.get("extension"),
+        file_type=args.get("file_type"),
+        pattern=args.get("pattern"),
+        date_range=args.get("date_range"),
+        size_range=args.get("size_range"),
+        sort_by=args.get("sort_by", "name"),
+        sort_order=args.get("sort_order", "asc"),
+        include_folders=args.get("include_folders", True),
+        include_files=args.get("include_files", True),
+        max_results=args.get("max_results"),
+        summary_only=args.get("summary_only", True),
+        sample_size=args.get("sample_size", 5)
+    )
+
+async def prefetch_default_listing():
+    """Scan the default folder in the background so a plain listing answers instantly"""
+    # Only rescan when the cached listing expired or a mutation invalidated it
+    if get_cached_read("list_directory_items", {}) is None:
+        await execute_function("list_directory_items", {})
+
+def prewarm_discover_user_paths():
+    """Start path discovery unless a fresh run is already waiting to be used"""
+    task = _prewarmed_discovery["task"]
+    if task is not None and time.monotonic() - _prewarmed_discovery["started_at"] < DISCOVERY_MAX_AGE_SECONDS:
+        return
+    if get_cached_read("discover_user_paths", {}) is not None:
+        return
+    _prewarmed_discovery.update(task=asyncio.create_task(discover_user_paths()), started_at=time.monotonic())
+
+async def _handle_list_directory_items(args):
+    return await list_directory_items(**listing_kwargs(args))
+
+async def _handle_filter_and_sort_by_modified(args):
+    # Scan the folder once and filter the entries directly, no intermediate listing
+    target_dir = get_directory(args.get("folder_name", "Desktop"), custom_path=args.get("custom_path"))
+    if not target_dir.is_dir():
+        return {"success": False, "error": f"'{target_dir}' is not a directory"}
+    items = await asyncio.to_thread(get_visible_items, target_dir)
+    return await asyncio.to_thread(filter_and_sort_by_modified, items, args.get("days", 7), args.get("top_n"))
+
+async def _handle_create_directory(args):
+    return await create_directory(Path(args.get("target_dir", "")), args.get("base_path", "Desktop"))
+
+async def _handle_create_multiple_directories(args):
+    return await create_multiple_directories(
+        args.get("directories", []),
+        args.get("base_path", "Desktop"),
+        args.get("execution_mode", "parallel")
+    )
+
+async def _handle_create_numbered_files(args):
+    return await create_numbered_files(
+        args.get("base_name", ""),
+        args.get("count", 1),
+        args.get("extension", "txt"),
+        args.get("start_number", 1),
+        args.get("target_dir"),
+        args.get("custom_path"),
+        args.get("execution_mode", "parallel")
+    )
+
+async def _handle_move_items_to_directory(args):
+    items = [Path(item) for item in args.get("items", [])]
+    return await move_items_to_directory(
+        items, Path(args.get("destination_dir", "")), args.get("execution_mode", "parallel")
+    )
+
+async def _handle_delete_single_item(args):
+    return await delete_single_item(args.get("item_path", ""))
+
+async def _handle_delete_multiple_items(args):
+    return await delete_multiple_items(args.get("item_paths", []), args.get("execution_mode", "parallel"))
+
+async def _handle_delete_items_by_pattern(args):
+    return await delete_items_by_pattern(
+        args.get("pattern", ""),
+        args.get("target_dir"),
+        args.get("custom_path"),
+        args.get("execution_mode", "parallel")
+    )
+
+async def _handle_list_nested_folders_tree(args):
+    return await asyncio.to_thread(
+        list_nested_folders_tree, args.get("target_dir"), args.get("max_depth", 3), args.get("custom_path")
+    )
+
+async def _handle_count_files_by_extension(args):
+    return await count_files_by_extension(args.get("folder_name"), args.get("custom_path"))
+
+async def _handle_get_file_type_statistics(args):
+    return await get_file_type_statistics(args.get("folder_name"), args.get("custom_path"))
+
+async def _handle_copy_multiple_items(args):
+    items = [Path(item) for item in args.get("items", [])]
+    return await copy_multiple_items(
+        items, Path(args.get("destination_dir", "")), args.get("execution_mode", "parallel")
+    )
+
+async def _handle_rename_multiple_items(args):
+    items = [(Path(item["old_path"]), item["new_name"]) for item in args.get("items", [])]
+    return await rename_multiple_items(items, args.get("execution_mode", "parallel"))
+
+async def _handle_find_duplicates_by_name(args):
+    # One scandir per folder; the DirEntry names feed the grouping without another walk
+    folders = [get_directory(name) for name in args.get("folder_names") or DUPLICATE_SEARCH_FOLDERS]
+    folders += [Path(path) for path in args.get("custom_paths", [])]
+    folders = [folder for folder in dict.fromkeys(folders) if folder.is_dir()]
+    
+    def scan():
+        items = [entry for folder in folders for entry in get_visible_items(folder)]
+        return find_duplicates_by_name(items)
+    
+    result = await asyncio.to_thread(scan)
+    if result["success"]:
+        result["folders"] = [str(folder) for folder in folders]
+    return result
+
+async def _handle_discover_user_paths(args):
+    task = _prewarmed_discovery["task"]
+    if task is not None and time.monotonic() - _prewarmed_discovery["started_at"] < DISCOVERY_MAX_AGE_SECONDS:
+        # Each warmed result answers one call; asking again rediscovers
+        _prewarmed_discovery["task"] = None
+        return await task
+    return await discover_user_paths()
+
+FUNCTION_HANDLERS = {
+    "list_directory_items": _handle_list_directory_items,
+    "filter_and_sort_by_modified": _handle_filter_and_sort_by_modified,
+    "create_directory": _handle_create_directory,
+    "create_multiple_directories": _handle_create_multiple_directories,
+    "create_numbered_files": _handle_create_numbered_files,
+    "move_items_to_directory": _handle_move_items_to_directory,
+    "delete_single_item": _handle_delete_single_item,
+    "delete_multiple_items": _handle_delete_multiple_items,
+    "delete_items_by_pattern": _handle_delete_items_by_pattern,
+    "list_nested_folders_tree": _handle_list_nested_folders_tree,
+    "count_files_by_extension": _handle_count_files_by_extension,
+    "get_file_type_statistics": _handle_get_file_type_statistics,
+    "copy_multiple_items": _handle_copy_multiple_items,
+    "rename_multiple_items": _handle_rename_multiple_items,
+    "find_duplicates_by_name": _handle_find_duplicates_by_name,
+    "discover_user_paths": _handle_discover_user_paths
+}
+
+def read_cache_key(function_name, function_args):
+    if function_name == "list_directory_items":
+        # Spelled-out defaults and omitted arguments list the same thing
+        function_args = listing_kwargs(function_args)
+    return function_name, json.dumps(function_args, sort_keys=True, default=str)
+
+def invalidate_read_cache():
+    """Forget every cached read and replayable routing decision"""
+    _read_cache["entries"].clear()
+    _read_cache["generation"] += 1
+    # Replayed routing decisions were made against the old filesystem too
+    response_cache.clear()
+
+def get_cached_read(function_name, function_args):
+    ttl = READ_CACHE_TTLS.get(function_name)
+    if ttl is None:
+        return None
+    key = read_cache_key(function_name, function_args)
+    entry = _read_cache["entries"].get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > ttl:
+        del _read_cache["entries"][key]
+        return None
+    return result
+
+def put_cached_read(function_name, function_args, result, generation):
+    # A mutation that finished while this read ran may have made the result stale
+    if generation != _read_cache["generation"] or function_name not in READ_CACHE_TTLS:
+        return
+    if not isinstance(result, dict) or result.get("success") is False:
+        return
+    entries = _read_cache["entries"]
+    entries[read_cache_key(function_name, function_args)] = (time.monotonic(), result)
+    if len(entries) > READ_CACHE_MAX_ENTRIES:
+        del entries[next(iter(entries))]
+
+async def execute_function(function_name, function_args):
+    """Run the Folderly function the model asked for and return its result"""
+    handler = FUNCTION_HANDLERS.get(function_name)
+    if handler is None:
+        return {"success": False, "error": f"Unknown function: {function_name}"}
+    try:
+        if function_name not in READ_ONLY_FUNCTIONS:
+            try:
+                return await handler(function_args)
+            finally:
+                invalidate_read_cache()
+
+        cached = get_cached_read(function_name, function_args)
+        if cached is not None:
+            return cached
+        generation = _read_cache["generation"]
+        result = await handler(function_args)
+        put_cached_read(function_name, function_args, result, generation)
+        return result
+    except Exception as e:
+        # Every tool call needs a reply in the history, so failures become results
+        return {"success": False, "error": str(e)}
+
+class JsonPrefixChecker:
+    """Tracks whether streamed text can still become a single JSON object"""
+
+    def __init__(self):
+        self.closers = []
+        self.in_string = False
+        self.escaped = False
+        self.started = False
+        self.finished = False
+
+    def feed(self, text: str) -> bool:
+        """Consume the next fragment; False once no continuation can be valid JSON"""
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+            if char in " \t\r\n":
+                continue
+            if self.finished or (not self.started and char != "{"):
+                return False
+            self.started = True
+            if char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.closers.append("}")
+            elif char == "[":
+                self.closers.append("]")
+            elif char in "}]":
+                if not self.closers or self.closers.pop() != char:
+                    return False
+                self.finished = not self.closers
+        return True
+
+def start_speculative_call(tool_call):
+    """Start a read-only call as soon as its streamed arguments form complete JSON"""
+    if "speculative" in tool_call or not tool_call["arguments"][-1].rstrip().endswith("}"):
+        return
+    name = "".join(tool_call["name"])
+    if name not in READ_ONLY_FUNCTIONS:
+        return
+    try:
+        args = loads_json("".join(tool_call["arguments"]))
+    except ValueError:
+        return
+    # Read-only calls are idempotent, so running them before the stream ends is safe
+    tool_call["speculative"] = (args, asyncio.create_task(execute_function(name, args)))
+
+def discard_speculative_calls(tool_calls):
+    """Cancel speculative runs whose tool calls will not be executed"""
+    for tool_call in tool_calls:
+        speculative = tool_call.pop("speculative", None)
+        if speculative is not None:
+            speculative[1].cancel()
+
+async def run_tool_call(tool_call, args):
+    """Execute a tool call, reusing its speculative run when the final arguments match"""
+    speculative = tool_call.pop("speculative", None)
+    if speculative is not None:
+        speculative_args, task = speculative
+        if speculative_args == args:
+            return await task
+        task.cancel()
+    return await execute_function(tool_call["name"], args)
+
+async def run_tool_calls(tool_calls, parsed_args):
+    """Run one message's tool calls in order, overlapping only consecutive read-only calls"""
+    results = []
+    reads = []
+    for index, (call, args) in enumerate(zip(tool_calls, parsed_args)):
+        if call["name"] in READ_ONLY_FUNCTIONS:
+            reads.append(run_tool_call(call, args))
+            continue
+        if reads:
+            results.extend(await asyncio.gather(*reads))
+            reads = []
+        # A later step may depend on this one, e.g. moving into a folder it creates
+        results.append(await run_tool_call(call, args))
+        # Reads speculated while streaming ran before this change
+        discard_speculative_calls(tool_calls[index + 1:])
+    if reads:
+        results.extend(await asyncio.gather(*reads))
+    return results
+
+def log_usage(model, usage):
+    """Log how much of the prompt was served from OpenAI's prompt cache"""
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) or 0
+    logger.debug("%s: %d prompt tokens, %d cached", model, usage.prompt_tokens, cached_tokens)
+
+async def stream_completion(conversation_history, model=ROUTING_MODEL, max_tokens=ROUTING_MAX_TOKENS):
+    """Stream one completion to the terminal and return its text, tool calls and finish reason"""
+    response = await _get_client().chat.completions.create(
+        model=model,
+        messages=conversation_history,
+        tools=TOOL_SCHEMAS,
+        tool_choice=TOOL_CHOICE,
+        temperature=0.1,
+        max_tokens=max_tokens,
+        stream=True,  # Enable streaming for real-time responses
+        stream_options={"include_usage": True}
+    )
+    
+    # Variables to track streaming response
+    content_parts = []
+    tool_calls_data = {}
+    argument_checkers = {}
+    finish_reason = None
+    
+    # Stream the response in real-time, writing tokens out at most ~30 times a second
+    write, flush = sys.stdout.write, sys.stdout.flush
+    pending_output = []
+    last_flush = time.monotonic()
+    async for chunk in response:
+        # The usage chunk comes last and has no choices
+        if not chunk.choices:
+            log_usage(model, chunk.usage)
+            continue
+        
+        if chunk.choices[0].delta.content:
+            content = chunk.choices[0].delta.content
+            content_parts.append(content)
+            pending_output.append(content)
+            now = time.monotonic()
+            if now - last_flush >= STREAM_FLUSH_SECONDS or "\n" in content:
+                write("".join(pending_output))
+                flush()
+                pending_output.clear()
+                last_flush = now
+        
+        # Tool calls arrive in fragments keyed by their index in the message
+        if chunk.choices[0].delta.tool_calls:
+            for delta in chunk.choices[0].delta.tool_calls:
+                # Fragments are buffered in lists and joined once the stream ends
+                tool_call = tool_calls_data.setdefault(delta.index, {"id": "", "name": [], "arguments": []})
+                if delta.id:
+                    tool_call["id"] = delta.id
+                if delta.function and delta.function.name:
+                    tool_call["name"].append(delta.function.name)
+                if delta.function and delta.function.arguments:
+                    tool_call["arguments"].append(delta.function.arguments)
+                    checker = argument_checkers.setdefault(delta.index, JsonPrefixChecker())
+                    if not checker.feed(delta.function.arguments):
+                        # Malformed arguments cannot recover; stop reading the rest of the response
+                        finish_reason = "malformed_arguments"
+                        break
+                    start_speculative_call(tool_call)
+        
+        if finish_reason == "malformed_arguments":
+            await response.close()
+            break
+        
+        if chunk.choices[0].finish_reason:
+            finish_reason = chunk.choices[0].finish_reason
+    
+    # Calls cut off by the token limit have incomplete arguments and must not run
+    if finish_reason == "length" and tool_calls_data:
+        discard_speculative_calls(tool_calls_data.values())
+        tool_calls_data = {}
+        finish_reason = "truncated_tool_calls"
+    elif finish_reason == "malformed_arguments":
+        # Leave the broken arguments in place; the caller's JSON parse fails and retries
+        discard_speculative_calls(tool_calls_data.values())
+    
+    pending_output.append("\n")  # New line after streaming
+    write("".join(pending_output))
+    flush()
+    
+    full_content = "".join(content_parts)
+    tool_calls = []
+    for index in sorted(tool_calls_data):
+        tool_call = tool_calls_data[index]
+        tool_call["name"] = "".join(tool_call["name"])
+        tool_call["arguments"] = "".join(tool_call["arguments"])
+        tool_calls.append(tool_call)
+    return full_content, tool_calls, finish_reason
+
 async def chat_with_ai():
-    print(load_welcome_message())
+    api_key = _load_env()
+    if not api_key:
+        print(load_error_message("api_key"))
+        exit(1)
     
-    # Initialize conversation history with fresh system prompt
-    conversation_history = [
-        {"role": "system", "content": load_system_prompt()}
-    ]
+    # Emit the start-up banner in a single write
+    sys.stdout.write(f"API Key loaded: {'Yes' if api_key else 'No'}\n{load_welcome_message()}\n")
+    sys.stdout.flush()
+    
+    # Resume the previous conversation under a fresh system prompt
+    conversation_history = load_history()
+    response_cache.load(RESPONSE_CACHE_PATH)
+    # prompt_toolkit needs a terminal; piped input keeps using input()
+    session = PromptSession() if PromptSession and sys.stdin.isatty() else None
+    summary_task = None
     
     while True:
         try:
-            user_input = input("\n💭 You: ").strip()
+            # Read input off the event loop so the prefetch runs while the user types
+            prefetch_task = asyncio.create_task(prefetch_default_listing())
+            prewarm_discover_user_paths()
+            if session:
+                user_input = (await session.prompt_async(USER_PROMPT)).strip()
+            else:
+                user_input = (await read_line_in_thread(USER_PROMPT)).strip()
+            await prefetch_task
             
-            if user_input.lower() in ['bye', 'goodbye', 'exit', 'quit']:
+            if is_exit_command(user_input):
                 print(load_goodbye_message())
                 break
                 
@@ -49,184 +868,123 @@ async def chat_with_ai():
                 print(load_empty_input_message())
                 continue
             
+            # Fold any queued lines into the same request, stopping at an exit command
+            requests = [user_input]
+            exit_after_turn = False
+            for line in await asyncio.to_thread(read_queued_lines):
+                if is_exit_command(line):
+                    exit_after_turn = True
+                    break
+                requests.append(line)
+            if len(requests) > 1:
+                user_input = load_batch_message(requests)
+            single_step = len(requests) == 1 and is_single_step_request(user_input)
+            
             # Add user message to conversation
             conversation_history.append({"role": "user", "content": user_input})
+            trimmed_history = trim_history(conversation_history)
+            if len(trimmed_history) < len(conversation_history):
+                # Summarize what leaves the window while this turn's requests run
+                head = history_head(conversation_history)
+                kept = len(trimmed_history) - len(head)
+                dropped = conversation_history[len(head):len(conversation_history) - kept]
+                previous = read_history_summary(head[1]) if len(head) > 1 else ""
+                summary_task = asyncio.create_task(summarize_history(dropped, previous))
+            conversation_history = trimmed_history
+
+            # A repeated read-only prompt can reuse the model's earlier routing decision
+            cached_calls = response_cache.get(user_input)
+            first_round = True
+            argument_retries = 0
+            retry_nudge = []
+            max_tokens = ROUTING_MAX_TOKENS
 
-            # Inner loop to handle multiple function calls per user input
+            # Inner loop to handle multiple rounds of tool calls per user input
             while True:
-                # Enable streaming for better UX
-                response = await client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=conversation_history,
-                    functions=get_function_schemas(),
-                    function_call="auto",
-                    temperature=0.1,
-                    max_tokens=2000,
-                    presence_penalty=0.1,
-                    frequency_penalty=0.1,
-                    stream=True  # Enable streaming for real-time responses
-                )
-                
-                # Variables to track streaming response
-                full_content = ""
-                function_call_data = {"name": "", "arguments": ""}
-                in_function_call = False
-                
-                # Stream the response in real-time
-                async for chunk in response:
-                    if chunk.choices[0].delta.content:
-                        content = chunk.choices[0].delta.content
-                        full_content += content
-                        print(content, end="", flush=True)
-                    
-                    # Handle function calls during streaming
-                    if chunk.choices[0].delta.function_call:
-                        if not in_function_call:
-                            in_function_call = True
-                        
-                        delta = chunk.choices[0].delta.function_call
-                        if delta.name:
-                            function_call_data["name"] += delta.name
-                        if delta.arguments:
-                            function_call_data["arguments"] += delta.arguments
+                if cached_calls:
+                    # Replay the cached tool calls against fresh filesystem data
+                    full_content = ""
+                    tool_calls = [
+                        {"id": f"call_cached_{index}", "name": call["name"], "arguments": call["arguments"]}
+                        for index, call in enumerate(cached_calls)
+                    ]
+                    cached_calls = None
+                    finish_reason = None
+                else:
+                    full_content, tool_calls, finish_reason = await stream_completion(
+                        conversation_history + retry_nudge, max_tokens=max_tokens
+                    )
+                retry_nudge = []
                 
-                print()  # New line after streaming
+                if finish_reason == "truncated_tool_calls":
+                    # The calls were dropped; ask again with more room instead of ending the turn blank
+                    argument_retries += 1
+                    if argument_retries > MAX_ARGUMENT_RETRIES or max_tokens >= RETRY_MAX_TOKENS:
+                        print(load_error_message("generic", "the requested operation was too long to finish, try splitting it up"))
+                        break
+                    max_tokens = min(max_tokens * 2, RETRY_MAX_TOKENS)
+                    retry_nudge = [{"role": "system", "content": load_force_prompt("truncated_arguments")}]
+                    continue
                 
-                # Check if we have a function call
-                if function_call_data["name"]:
-                    function_name = function_call_data["name"]
+                # Check if we have tool calls
+                if tool_calls:
                     try:
-                        function_args = json.loads(function_call_data["arguments"])
+                        parsed_args = [loads_json(call["arguments"] or "{}") for call in tool_calls]
                     except json.JSONDecodeError:
-                        # Handle incomplete JSON
+                        # Handle incomplete JSON: retry with a reminder, but not forever
+                        discard_speculative_calls(tool_calls)
+                        argument_retries += 1
+                        if argument_retries > MAX_ARGUMENT_RETRIES:
+                            print(load_error_message("generic", "the assistant kept sending malformed function arguments"))
+                            break
+                        retry_nudge = [{"role": "system", "content": load_force_prompt("malformed_arguments")}]
                         continue
                     
-                    # Helper function to get arguments with defaults
-                    def get_arg(key, default=None):
-                        return function_args.get(key, default)
+                    if first_round and all(call["name"] in READ_ONLY_FUNCTIONS for call in tool_calls):
+                        response_cache.put(user_input, tool_calls)
+                    first_round = False
                     
-                    # Execute appropriate function
-                    if function_name == "list_directory_items":
-                        result = await list_directory_items(
-                            custom_path=get_arg("custom_path"),
-                            folder_name=get_arg("folder_name"),
-                            extension=get_arg("extension"),
-                            file_type=get_arg("file_type"),
-                            pattern=get_arg("pattern"),
-                            date_range=get_arg("date_range"),
-                            size_range=get_arg("size_range"),
-                            sort_by=get_arg("sort_by", "name"),
-                            sort_order=get_arg("sort_order", "asc"),
-                            include_folders=get_arg("include_folders", True),
-                            include_files=get_arg("include_files", True),
-                            max_results=get_arg("max_results"),
-                            summary_only=get_arg("summary_only", True),
-                            sample_size=get_arg("sample_size", 5)
-                        )
-                    elif function_name == "filter_and_sort_by_modified":
-                        # Get items first, then filter by date
-                        items_result = await list_directory_items(
-                            folder_name=get_arg("folder_name", "Desktop"),
-                            custom_path=get_arg("custom_path"),
-                            summary_only=True,
-                            sample_size=5
-                        )
-                        if items_result["success"]:
-                            # Convert string paths back to Path objects for the filter function
-                            items = [Path(path) for path in items_result["full_results"]]
-                            days = get_arg("days", 7)
-                            result = filter_and_sort_by_modified(items, days)  # No await needed
-                        else:
-                            result = items_result
-                    elif function_name == "create_directory":
-                        # Create directory with base path support
-                        target_dir = Path(get_arg("target_dir", ""))
-                        base_path = get_arg("base_path", "Desktop")
-                        result = await create_directory(target_dir, base_path)
-                    elif function_name == "create_multiple_directories":
-                        # Create multiple directories with base path support
-                        directories = get_arg("directories", [])
-                        base_path = get_arg("base_path", "Desktop")
-                        execution_mode = get_arg("execution_mode", "parallel")
-                        result = await create_multiple_directories(directories, base_path, execution_mode)
-                    elif function_name == "create_numbered_files":
-                        # Create numbered files with execution mode support
-                        base_name = get_arg("base_name", "")
-                        count = get_arg("count", 1)
-                        extension = get_arg("extension", "txt")
-                        start_number = get_arg("start_number", 1)
-                        target_dir = get_arg("target_dir", None)
-                        custom_path = get_arg("custom_path", None)
-                        execution_mode = get_arg("execution_mode", "parallel")
-                        result = await create_numbered_files(base_name, count, extension, start_number, target_dir, custom_path, execution_mode)
-                    elif function_name == "move_items_to_directory":
-                        # Move items to destination directory
-                        items = [Path(item) for item in get_arg("items", [])]
-                        destination_dir = Path(get_arg("destination_dir", ""))
-                        execution_mode = get_arg("execution_mode", "parallel")
-                        result = await move_items_to_directory(items, destination_dir, execution_mode)
-                    elif function_name == "delete_single_item":
-                        # Delete a single item
-                        item_path = get_arg("item_path", "")
-                        result = await delete_single_item(item_path)
-                    elif function_name == "delete_multiple_items":
-                        # Delete multiple items
-                        item_paths = get_arg("item_paths", [])
-                        execution_mode = get_arg("execution_mode", "parallel")
-                        result = await delete_multiple_items(item_paths, execution_mode)
-                    elif function_name == "delete_items_by_pattern":
-                        # Delete items by pattern
-                        pattern = get_arg("pattern", "")
-                        target_dir = get_arg("target_dir", None)
-                        custom_path = get_arg("custom_path", None)
-                        execution_mode = get_arg("execution_mode", "parallel")
-                        result = await delete_items_by_pattern(pattern, target_dir, custom_path, execution_mode)
-                    elif function_name == "list_nested_folders_tree":
-                        # List nested folders in tree structure
-                        target_dir = get_arg("target_dir", None)
-                        max_depth = get_arg("max_depth", 3)
-                        custom_path = get_arg("custom_path", None)
-                        result = list_nested_folders_tree(target_dir, max_depth, custom_path)  # No await needed
-                    elif function_name == "count_files_by_extension":
-                        # Count files by extension
-                        custom_path = get_arg("custom_path", None)
-                        folder_name = get_arg("folder_name", None)
-                        result = await count_files_by_extension(folder_name, custom_path)
-                    elif function_name == "get_file_type_statistics":
-                        # Get file type statistics
-                        custom_path = get_arg("custom_path", None)
-                        folder_name = get_arg("folder_name", None)
-                        result = await count_files_by_extension(folder_name, custom_path)
-                    elif function_name == "copy_multiple_items":
-                        # Copy multiple items to destination directory
-                        items = [Path(item) for item in get_arg("items", [])]
-                        destination_dir = Path(get_arg("destination_dir", ""))
-                        execution_mode = get_arg("execution_mode", "parallel")
-                        result = await copy_multiple_items(items, destination_dir, execution_mode)
-                    elif function_name == "rename_multiple_items":
-                        # Rename multiple items with new names
-                        items_data = get_arg("items", [])
-                        items = [(Path(item["old_path"]), item["new_name"]) for item in items_data]
-                        execution_mode = get_arg("execution_mode", "parallel")
-                        result = await rename_multiple_items(items, execution_mode)
-                    elif function_name == "discover_user_paths":
-                        # Discover all user folder paths for path selection
-                        result = await discover_user_paths()
-                    else:
-                        result = {"success": False, "error": f"Unknown function: {function_name}"}
+                    results = await run_tool_calls(tool_calls, parsed_args)
                     
-                    # Ensure we have a valid result before proceeding
-                    if not result or "success" not in result:
-                        result = {"success": False, "error": "Function returned invalid result"}
-                    
-                    # Add function result to conversation
                     conversation_history.append({
-                        "role": "function", 
-                        "name": function_name, 
-                        "content": json.dumps(result, indent=2)
+                        "role": "assistant",
+                        "content": full_content or None,
+                        "tool_calls": [
+                            {
+                                "id": call["id"],
+                                "type": "function",
+                                "function": {"name": call["name"], "arguments": call["arguments"]}
+                            }
+                            for call in tool_calls
+                        ]
                     })
                     
-                    # Continue the inner loop to see if AI wants to call another function
+                    replies = []
+                    for call, result in zip(tool_calls, results):
+                        # Ensure we have a valid result before proceeding
+                        if not result or "success" not in result:
+                            result = {"success": False, "error": "Function returned invalid result"}
+                        replies.append(load_result_reply(call["name"], result))
+                        
+                        # Add tool result to conversation
+                        conversation_history.append({
+                            "role": "tool",
+                            "tool_call_id": call["id"],
+                            "content": dumps_result(compact_result(
+                                result, RESULT_LIST_LIMITS.get(call["name"], MAX_RESULT_LIST_ITEMS)
+                            ))
+                        })
+                    
+                    # Clean create/move/delete results need no narration, skip the follow-up request,
+                    # unless the request has later steps the model still has to call
+                    if all(replies) and single_step:
+                        reply = "\n".join(replies)
+                        sys.stdout.write(reply + "\n")
+                        sys.stdout.flush()
+                        conversation_history.append({"role": "assistant", "content": reply})
+                        break
+                    
+                    # Continue the inner loop to see if AI wants to call more tools
                     continue
                 
                 else:
@@ -236,12 +994,39 @@ async def chat_with_ai():
                         "content": full_content
                     })
                     break  # Exit the inner loop and wait for next user input
+            
+            if summary_task:
+                conversation_history = await fold_summary(conversation_history, summary_task)
+                summary_task = None
+            
+            save_history(conversation_history)
+            response_cache.save(RESPONSE_CACHE_PATH)
+            
+            if exit_after_turn:
+                print(load_goodbye_message())
+                break
                 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError, EOFError):
+            # asyncio.run turns Ctrl-C into a cancellation of this task; end the chat cleanly instead
+            task = asyncio.current_task()
+            if hasattr(task, "uncancel") and task.cancelling():
+                task.uncancel()
+            if summary_task:
+                # Don't hold up the exit for a network call
+                summary_task.cancel()
             print("\n👋 See you later! 👋")
+            save_history(conversation_history)
+            response_cache.save(RESPONSE_CACHE_PATH)
             break
         except Exception as e:
             print(load_error_message("generic", str(e)))
+            if summary_task:
+                # The failed turn still trimmed the history; keep what it dropped in the summary
+                conversation_history = await fold_summary(conversation_history, summary_task)
+                summary_task = None
+    
+    # Drain pooled connections while the event loop is still running
+    await close_client()
 
 if __name__ == "__main__":
     main_sync()
\ No newline at end of file
@@ -3,7 +3,7 @@ Folderly AI Function Calling Schemas
 JSON schemas for AI function calling in the Folderly codebase.
 """
 
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 
 # ============================================================================
 # AI FUNCTION CALLING SCHEMAS
@@ -91,6 +91,10 @@ FOLDERLY_FUNCTIONS = [
                 "days": {
                     "type": "integer",
                     "description": "Number of days to look back for modified items"
+                },
+                "top_n": {
+                    "type": "integer",
+                    "description": "Only return the N most recently modified items (e.g. 'last 5 files I touched')"
                 }
             },
             "required": ["items", "days"]
@@ -320,6 +324,26 @@ FOLDERLY_FUNCTIONS = [
             "required": ["action"]
         }
     },
+    {
+        "name": "find_duplicates_by_name",
+        "description": "Finds files and folders that share the same name (ignoring case) across several folders, e.g. the same download saved to both Desktop and Downloads",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "folder_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Root folders to compare (Desktop, Downloads, Documents, etc.). Default: Desktop, Downloads and Documents"
+                },
+                "custom_paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Additional full folder paths to include in the comparison"
+                }
+            },
+            "required": []
+        }
+    },
     {
         "name": "discover_user_paths",
         "description": "Discovers all possible Desktop, Documents, Downloads, Pictures, Music, and Videos locations in the user's profile, including OneDrive variations. Use this to understand the user's file structure and help them choose which location to work with.",
@@ -338,4 +362,34 @@ def get_function_schemas() -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of function schemas in OpenAI function calling format
     """
-    return FOLDERLY_FUNCTIONS 
\ No newline at end of file
+    return FOLDERLY_FUNCTIONS
+
+def validate_function_schemas(schemas: List[Dict[str, Any]]) -> None:
+    """
+    Checks the schemas once so malformed definitions fail at startup, not per request.
+    
+    Raises:
+        ValueError: If a schema is missing its name or object parameters, or a name repeats
+    """
+    seen = set()
+    for schema in schemas:
+        name = schema.get("name")
+        if not name:
+            raise ValueError(f"Function schema without a name: {schema}")
+        if name in seen:
+            raise ValueError(f"Duplicate function schema: {name}")
+        if schema.get("parameters", {}).get("type") != "object":
+            raise ValueError(f"Function schema '{name}' must take object parameters")
+        seen.add(name)
+
+def get_tool_schemas() -> Tuple[Dict[str, Any], ...]:
+    """
+    Returns the validated function schemas wrapped for the tools API.
+    
+    Returns:
+        Tuple[Dict[str, Any], ...]: Immutable sequence of tool definitions in OpenAI tools format
+    """
+    validate_function_schemas(FOLDERLY_FUNCTIONS)
+    # A fixed order keeps the tools block byte-identical between requests, so the prompt prefix stays cacheable
+    ordered = sorted(FOLDERLY_FUNCTIONS, key=lambda schema: schema["name"])
+    return tuple({"type": "function", "function": schema} for schema in ordered)
@@ -3,6 +3,8 @@ Folderly AI Prompt Management
 Centralized prompt management for the Folderly AI system.
 """
 
+import re
+
 # ============================================================================
 # SYSTEM PROMPTS
 # ============================================================================
@@ -34,10 +36,12 @@ AVAILABLE FUNCTIONS:
 - rename_multiple_items: Rename multiple items
 - list_nested_folders_tree: Show nested folder structure
 - discover_user_paths: Discover all Desktop/Documents/Downloads locations including OneDrive variations
+- find_duplicates_by_name: Find files and folders with the same name across folders
 
 CRITICAL FUNCTION SELECTION RULES:
 - 'scan', 'show', 'list', 'display' → List files and folders (use summary mode)
 - 'count', 'statistics', 'how many' → Get file statistics
+- 'duplicates', 'same name' → Find duplicates by name
 - 'create folder' → Create directory
 - 'create folders' (multiple) → Create multiple directories
 - 'move' → Move files/folders
@@ -207,6 +211,27 @@ Always show:
 DO NOT respond conversationally. Execute the function directly.
 """
 
+MALFORMED_ARGUMENTS_PROMPT = """
+Your last function call arguments were malformed JSON and were discarded.
+Call the function again with arguments that are one valid JSON object.
+"""
+
+TRUNCATED_ARGUMENTS_PROMPT = """
+Your last function call was cut off by the output length limit and was discarded.
+Call the function again; split very long item lists across several calls.
+"""
+
+BATCH_REQUEST_PROMPT = """Batch of user requests, answer each.
+Independent requests should be handled with parallel tool calls in a single response.
+{requests}"""
+
+HISTORY_SUMMARY_PROMPT = """You maintain the running memory of a file-management chat.
+Merge the previous summary with the older messages below into one short summary (at most 5 lines).
+Keep folders, files, paths and operations the user referred to and any stated preferences; drop chit-chat and raw listings."""
+
+# Prefix marking the running summary message so it survives reloads and trimming
+HISTORY_SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
 # ============================================================================
 # WELCOME & ERROR MESSAGES
 # ============================================================================
@@ -236,6 +261,30 @@ OPENAI_API_KEY=your_api_key_here
 
 GENERIC_ERROR = "😅 Oops! Something went wrong: {error}"
 
+# ============================================================================
+# RESULT REPLIES
+# ============================================================================
+
+# Operations whose outcome is fully described by their result, so the reply
+# can be filled in locally instead of asking the model to narrate it
+RESULT_REPLIES = {
+    "create_directory": "📁 Created folder {directory_created}",
+    "create_directory_existing": "📁 Folder {directory_created} already exists",
+    "create_multiple_directories": "📁 Created {total_created} folder(s) in {base_path}",
+    "create_numbered_files": "📄 Created {total_created} file(s) in {target_directory}",
+    "delete_single_item": "🗑️ Moved {deleted_item} to the trash",
+    "delete_multiple_items": "🗑️ Moved {total_deleted} item(s) to the trash",
+    "move_items_to_directory": "📦 Moved {total_moved} item(s) to {destination}",
+    "copy_multiple_items": "📋 Copied {total_copied} item(s) to {destination}",
+    "rename_multiple_items": "✏️ Renamed {total_renamed} item(s)"
+}
+
+# Requests that chain steps ("create X and move Y into it") need the model for the later steps
+MULTI_STEP_MARKERS = re.compile(r"\b(?:and|then|also|after|afterwards)\b|[,;&]", re.IGNORECASE)
+ACTION_VERBS = re.compile(
+    r"\b(create|make|move|put|copy|delete|remove|trash|rename|organi[sz]e|sort)\b", re.IGNORECASE
+)
+
 # ============================================================================
 # PROMPT LOADING FUNCTIONS
 # ============================================================================
@@ -250,10 +299,28 @@ def load_force_prompt(prompt_type: str) -> str:
         "smart_folder_structure": SMART_FOLDER_STRUCTURE_PROMPT,
         "tree_structure": TREE_STRUCTURE_PROMPT,
         "list_files": LIST_FILES_PROMPT,
-        "delete": DELETE_OPERATION_PROMPT
+        "delete": DELETE_OPERATION_PROMPT,
+        "malformed_arguments": MALFORMED_ARGUMENTS_PROMPT,
+        "truncated_arguments": TRUNCATED_ARGUMENTS_PROMPT
     }
     return prompts.get(prompt_type, "")
 
+def load_batch_message(requests: list) -> str:
+    numbered = "\n".join(f"{i}) {request}" for i, request in enumerate(requests, 1))
+    return BATCH_REQUEST_PROMPT.format(requests=numbered)
+
+def load_history_summary_prompt() -> str:
+    return HISTORY_SUMMARY_PROMPT
+
+def load_history_summary_message(summary: str) -> dict:
+    return {"role": "system", "content": HISTORY_SUMMARY_PREFIX + summary}
+
+def read_history_summary(message: dict) -> str:
+    return message["content"][len(HISTORY_SUMMARY_PREFIX):]
+
+def is_history_summary_message(message: dict) -> bool:
+    return message.get("role") == "system" and str(message.get("content", "")).startswith(HISTORY_SUMMARY_PREFIX)
+
 def load_welcome_message() -> str:
     return WELCOME_MESSAGE
 
@@ -270,3 +337,23 @@ def load_error_message(error_type: str, error_details: str = "") -> str:
         return GENERIC_ERROR.format(error=error_details)
     else:
         return f"❌ Error: {error_details}"
+
+def is_single_step_request(text: str) -> bool:
+    """True when the request reads as one operation, so its result can end the turn"""
+    if MULTI_STEP_MARKERS.search(text):
+        return False
+    return len({verb.lower() for verb in ACTION_VERBS.findall(text)}) <= 1
+
+def load_result_reply(function_name: str, result: dict):
+    """Reply for a fully successful operation, or None if the model should explain it"""
+    if function_name == "create_directory" and result.get("already_existed"):
+        function_name = "create_directory_existing"
+    template = RESULT_REPLIES.get(function_name)
+    if template is None or not result.get("success"):
+        return None
+    if result.get("total_failed") or result.get("failed_items") or result.get("skipped_items"):
+        return None
+    try:
+        return template.format(**result)
+    except KeyError:
+        return None
@@ -0,0 +1,147 @@
+"""
+Folderly Response Cache
+Remembers the tool calls the model chose for repeated prompts so the first
+completion of a turn can be skipped.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ============================================================================
+# CACHE SETTINGS
+# ============================================================================
+
+# Prompts mentioning these verbs change the filesystem and are never replayed
+MUTATING_VERBS = ("delete", "remove", "trash", "move", "rename", "create", "make", "copy")
+
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_MAX_ENTRIES = 256
+
+# Runs of punctuation and whitespace, collapsed to one space in a single pass
+_NON_WORD_RUN = re.compile(r"\W+")
+_MUTATING = re.compile("|".join(map(re.escape, MUTATING_VERBS)))
+# Prompts that point back at earlier turns ("sort it by date") depend on the conversation
+_CONTEXT_REFERENCES = re.compile(r"\b(?:it|its|that|this|these|those|them|they|same|again|above)\b")
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+class ResponseCache:
+    """In-memory cache mapping a normalized prompt to the model's tool calls"""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._dirty = False
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase, drop punctuation and collapse whitespace"""
+        return _NON_WORD_RUN.sub(" ", text.lower()).strip()
+
+    def is_cacheable(self, text: str) -> bool:
+        """Only read-only prompts may be answered from the cache"""
+        return self._cache_key(text) is not None
+
+    def _cache_key(self, text: str) -> Optional[str]:
+        """Normalize once and scan for every mutating verb in a single regex pass"""
+        key = self.normalize(text)
+        if not key or _MUTATING.search(key) or _CONTEXT_REFERENCES.search(key):
+            return None
+        # Relative folder names resolve against the working directory, so it is part of the key
+        cwd = hashlib.blake2b(os.getcwd().encode("utf-8", "surrogateescape"), digest_size=8)
+        return f"{key}|{cwd.hexdigest()}"
+
+    def get(self, text: str) -> Optional[List[Dict[str, str]]]:
+        """Return the cached tool calls for a prompt, if still fresh"""
+        key = self._cache_key(text)
+        if key is None:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, tool_calls = entry
+        # Wall-clock time so entries loaded from a previous session age correctly
+        if time.time() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._dirty = True
+            return None
+
+        self._entries.move_to_end(key)
+        return [dict(call) for call in tool_calls]
+
+    def put(self, text: str, tool_calls: List[Dict[str, str]]) -> None:
+        """Remember the tool calls the model chose for a prompt"""
+        key = self._cache_key(text)
+        if key is None:
+            return
+
+        calls = [{"name": call["name"], "arguments": call["arguments"]} for call in tool_calls]
+        self._entries[key] = (time.time(), calls)
+        self._entries.move_to_end(key)
+        self._dirty = True
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        if self._entries:
+            self._entries.clear()
+            self._dirty = True
+
+    def load(self, path: Path) -> None:
+        """Restore entries saved by a previous session, skipping expired or malformed ones"""
+        try:
+            data = Path(path).read_bytes()
+            saved = orjson.loads(data) if orjson else json.loads(data)
+        except (OSError, ValueError):
+            return
+
+        now = time.time()
+        for item in saved if isinstance(saved, list) else []:
+            try:
+                key, stored_at, calls = item
+                calls = [{"name": call["name"], "arguments": call["arguments"]} for call in calls]
+            except (TypeError, ValueError, KeyError):
+                continue
+            if now - stored_at <= self.ttl_seconds:
+                self._entries[key] = (stored_at, calls)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self, path: Path) -> None:
+        """Write the entries to disk atomically, only when they changed since the last save"""
+        if not self._dirty:
+            return
+
+        path = Path(path)
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            entries = [[key, stored_at, calls] for key, (stored_at, calls) in self._entries.items()]
+            if orjson:
+                data = orjson.dumps(entries)
+            else:
+                data = json.dumps(entries, separators=(",", ":")).encode("utf-8")
+            temp_path.write_bytes(data)
+            os.replace(temp_path, path)
+            self._dirty = False
+        except OSError:
+            # The cache is an optimization; failing to persist it is harmless
+            pass
@@ -1,12 +1,27 @@
 import os
 import re
+import stat
+import sys
+import time
 from pathlib import Path
 from typing import List, Dict, Any
 import shutil
 import asyncio
-from datetime import datetime, timedelta
+import errno
+import functools
+import heapq
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from send2trash import send2trash
 
+try:
+    import fcntl
+except ImportError:
+    # Windows has no ioctl interface; copies go straight to shutil.copy2
+    fcntl = None
+
 try:
     from config import TARGET_FOLDER
 except ImportError:
@@ -23,6 +38,21 @@ FILE_TYPE_MAPPINGS = {
     "code": [".py", ".js", ".html", ".css", ".java", ".cpp", ".c", ".php", ".rb", ".go"]
 }
 
+SECONDS_PER_DAY = 86_400.0
+
+# Linux ioctl that makes dst share src's extents (reflink) on btrfs, XFS and friends
+FICLONE = 0x40049409
+CAN_REFLINK = fcntl is not None and sys.platform.startswith("linux")
+
+# errnos meaning "this filesystem (pair) cannot clone", as opposed to a one-off failure
+REFLINK_UNSUPPORTED_ERRNOS = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS}
+
+# (src st_dev, dst st_dev) pairs where a clone already failed; ext4/tmpfs copies skip the ioctl
+_reflink_unsupported = set()
+
+# Upper bound on concurrent file operations; each one mostly waits on disk or network I/O
+MAX_IO_WORKERS = 32
+
 # Folder name mappings for cross-platform compatibility
 FOLDER_MAPPINGS = {
     "documents": ["Documents", "My Documents", "Documenti"],
@@ -33,17 +63,29 @@ FOLDER_MAPPINGS = {
     "videos": ["Videos", "My Videos", "Video"]
 }
 
-async def execute_operations(operations, execution_mode="parallel"):
-    """Execute multiple operations in parallel or sequential mode"""
+async def execute_operations(operations, execution_mode="parallel", max_workers: int = None):
+    """Execute multiple operations in parallel or sequential mode
+    
+    max_workers runs the sync operations on a dedicated thread pool of that size
+    instead of asyncio's shared default executor.
+    """
     if execution_mode == "parallel":
-        # Handle both async and sync functions
-        tasks = []
-        for func, args, kwargs in operations:
-            if asyncio.iscoroutinefunction(func):
-                tasks.append(func(*args, **kwargs))
-            else:
-                tasks.append(asyncio.to_thread(func, *args, **kwargs))
-        return await asyncio.gather(*tasks)
+        executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers else None
+        loop = asyncio.get_running_loop()
+        try:
+            # Handle both async and sync functions
+            tasks = []
+            for func, args, kwargs in operations:
+                if asyncio.iscoroutinefunction(func):
+                    tasks.append(func(*args, **kwargs))
+                elif executor:
+                    tasks.append(loop.run_in_executor(executor, functools.partial(func, *args, **kwargs)))
+                else:
+                    tasks.append(asyncio.to_thread(func, *args, **kwargs))
+            return await asyncio.gather(*tasks)
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
     else:
         results = []
         for func, args, kwargs in operations:
@@ -54,7 +96,19 @@ async def execute_operations(operations, execution_mode="parallel"):
             results.append(result)
         return results
 
-def get_directory(folder_name: str = None, root_dir: Path = Path.home(), custom_path: str = None) -> Path:
+async def run_io_parallel(func, items, execution_mode="parallel"):
+    """Run a blocking per-item I/O function over items on a thread pool sized to the batch
+    
+    The os/shutil calls inside release the GIL around their syscalls, so the
+    workers overlap disk and network latency.
+    """
+    operations = [(func, (item,), {}) for item in items]
+    return await execute_operations(operations, execution_mode, max_workers=min(MAX_IO_WORKERS, len(operations)) or None)
+
+# Root folders found on disk, keyed by (root_dir, folder_name); misses are never cached
+_resolved_directories: Dict[tuple, Path] = {}
+
+def get_directory(folder_name: str = None, root_dir: Path = None, custom_path: str = None) -> Path:
     """Get directory path for any root folder (Desktop, Downloads, Documents, etc.) or custom path"""
     
     if custom_path:
@@ -65,6 +119,24 @@ def get_directory(folder_name: str = None, root_dir: Path = Path.home(), custom_
     if folder_name is None:
         folder_name = TARGET_FOLDER
     
+    # Resolved lazily so a changed $HOME is honored, then memoized per (home, folder)
+    if root_dir is None:
+        root_dir = Path.home()
+    
+    cache_key = (root_dir, folder_name)
+    cached = _resolved_directories.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    resolved = _resolve_directory(folder_name, root_dir)
+    if resolved is not None:
+        _resolved_directories[cache_key] = resolved
+        return resolved
+    
+    return root_dir / folder_name
+
+def _resolve_directory(folder_name: str, root_dir: Path):
+    """Probes the exact, localized and OneDrive locations of a root folder"""
     folder_lower = folder_name.lower() if folder_name else TARGET_FOLDER.lower()
     
     exact_path = root_dir / folder_name
@@ -90,7 +162,7 @@ def get_directory(folder_name: str = None, root_dir: Path = Path.home(), custom_
                 if onedrive_path.exists():
                     return onedrive_path
     
-    return root_dir / folder_name
+    return None
 
 async def list_directory_items(
     folder_name: str = None,
@@ -126,52 +198,79 @@ async def list_directory_items(
                 "folder_name": folder_name or TARGET_FOLDER
             }
         
-        all_items = list(target_dir.iterdir())
         results = []
+        # Summary counts are gathered during the scan instead of a second pass over results
+        extension_counts = Counter()
+        file_count = 0
+        folder_count = 0
+        # Compile the name filter once rather than per entry
+        name_pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+        extension_suffix = f".{extension.lower()}" if extension else None
+        # The date filter becomes a float range compared directly against st_mtime
+        mtime_bounds = date_range_to_mtime_bounds(date_range) if date_range else None
         
         # Auto-skip problematic files
-        for item in all_items:
-            try:
-                # Skip hidden files and system files
-                if item.name.startswith('.') or item.name.startswith('~'):
-                    continue
-                
-                item_info = {
-                    "name": item.name,
-                    "path": str(item),
-                    "is_file": item.is_file(),
-                    "is_dir": item.is_dir(),
-                    "size": item.stat().st_size if item.is_file() else None,
-                    "modified": datetime.fromtimestamp(item.stat().st_mtime).isoformat()
-                }
-                
-                if not include_folders and item.is_dir():
-                    continue
-                if not include_files and item.is_file():
-                    continue
-                
-                if extension and item.is_file():
-                    if not item.name.lower().endswith(f".{extension.lower()}"):
+        with os.scandir(target_dir) as entries:
+            for entry in entries:
+                try:
+                    # Bind the name once; every filter below reads it
+                    name = entry.name
+                    
+                    # Skip hidden files and system files
+                    if name.startswith(('.', '~')):
                         continue
-                
-                if file_type and item.is_file():
-                    if not is_file_type_match(item.name, file_type):
+                    
+                    # DirEntry caches the file type from the directory read
+                    is_file = entry.is_file()
+                    is_dir = entry.is_dir()
+                    
+                    # Name and type filters run before the stat, so rejected entries cost no syscall
+                    if not include_folders and is_dir:
                         continue
-                
-                if pattern and not re.search(pattern, item.name, re.IGNORECASE):
-                    continue
-                
-                if date_range and not is_in_date_range(item_info["modified"], date_range):
-                    continue
-                
-                if size_range and item.is_file():
-                    if not is_in_size_range(item_info["size"], size_range):
+                    if not include_files and is_file:
                         continue
-                
-                results.append(item_info)
-            except (PermissionError, OSError):
-                # Skip files we can't access
-                continue
+                    
+                    if extension_suffix and is_file:
+                        if not name.lower().endswith(extension_suffix):
+                            continue
+                    
+                    if file_type and is_file:
+                        if not is_file_type_match(name, file_type):
+                            continue
+                    
+                    if name_pattern and not name_pattern.search(name):
+                        continue
+                    
+                    stat_result = entry.stat()
+                    mtime = stat_result.st_mtime
+                    
+                    if mtime_bounds and not (mtime_bounds[0] <= mtime <= mtime_bounds[1]):
+                        continue
+                    
+                    if size_range and is_file:
+                        if not is_in_size_range(stat_result.st_size, size_range):
+                            continue
+                    
+                    item_info = {
+                        "name": name,
+                        "path": entry.path,
+                        "is_file": is_file,
+                        "is_dir": is_dir,
+                        "size": stat_result.st_size if is_file else None,
+                        "modified": datetime.fromtimestamp(mtime).isoformat()
+                    }
+                    
+                    results.append(item_info)
+                    if is_file:
+                        file_count += 1
+                        ext = os.path.splitext(name)[1].lower()
+                        if ext:
+                            extension_counts[ext] += 1
+                    else:
+                        folder_count += 1
+                except (PermissionError, OSError):
+                    # Skip files we can't access
+                    continue
         
         if sort_by == "name":
             results.sort(key=lambda x: x["name"].lower(), reverse=(sort_order == "desc"))
@@ -180,22 +279,8 @@ async def list_directory_items(
         elif sort_by == "size":
             results.sort(key=lambda x: x["size"] or 0, reverse=(sort_order == "desc"))
         
-        # Calculate extension statistics
-        extension_counts = {}
-        file_count = 0
-        folder_count = 0
-        
-        for item in results:
-            if item["is_file"]:
-                file_count += 1
-                ext = Path(item["name"]).suffix.lower()
-                if ext:
-                    extension_counts[ext] = extension_counts.get(ext, 0) + 1
-            else:
-                folder_count += 1
-        
         # Sort extensions by count
-        top_extensions = sorted(extension_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+        top_extensions = extension_counts.most_common(5)
         
         if summary_only:
             # Return compact summary
@@ -251,17 +336,31 @@ async def list_directory_items(
             "folder_name": folder_name or TARGET_FOLDER
         }
 
-def filter_and_sort_by_modified(items: List[Path], days: int) -> Dict[str, Any]:
-    """Filter and sort items by modification date"""
+def get_visible_items(target_dir: Path) -> List[os.DirEntry]:
+    """Returns the non-hidden entries of a directory; each DirEntry caches its stat"""
+    with os.scandir(target_dir) as entries:
+        return [entry for entry in entries if not entry.name.startswith(('.', '~'))]
+
+def filter_and_sort_by_modified(items: List[Path], days: int, top_n: int = None) -> Dict[str, Any]:
+    """Filter and sort items (Paths or DirEntries) by modification date, optionally keeping only the newest top_n"""
     try:
-        cutoff = datetime.now() - timedelta(days=days)
-        filtered = [p for p in items if datetime.fromtimestamp(p.stat().st_mtime) >= cutoff]
-        sorted_items = sorted(filtered, key=lambda p: p.stat().st_mtime, reverse=True)
+        # Compare raw st_mtime floats against a single precomputed cutoff
+        cutoff_ts = time.time() - days * SECONDS_PER_DAY
+        
+        # Stat each item once and sort on the same mtime used for filtering
+        dated = [(item.stat().st_mtime, os.fspath(item)) for item in items]
+        dated = [pair for pair in dated if pair[0] >= cutoff_ts]
+        total_found = len(dated)
+        if top_n is not None and top_n < total_found:
+            # Partial selection is O(N log top_n) instead of sorting everything
+            dated = heapq.nlargest(top_n, dated)
+        else:
+            dated.sort(reverse=True)
         
         return {
             "success": True,
-            "results": [str(path) for path in sorted_items],
-            "total_found": len(sorted_items),
+            "results": [path for _, path in dated],
+            "total_found": total_found,
             "days_threshold": days
         }
     except Exception as e:
@@ -276,14 +375,21 @@ async def create_directory(target_dir: Path, base_path: str = "Desktop") -> Dict
         base_directory = get_directory(base_path)
         full_path = base_directory / target_dir
         
-        full_path.mkdir(parents=True, exist_ok=True)
+        # mkdir itself reports whether the folder was there; no extra exists() stat afterwards
+        try:
+            full_path.mkdir(parents=True)
+            already_existed = False
+        except FileExistsError:
+            if not full_path.is_dir():
+                raise
+            already_existed = True
         
         return {
             "success": True,
             "results": str(full_path),
             "directory_created": str(full_path),
             "base_path": str(base_directory),
-            "already_existed": full_path.exists()
+            "already_existed": already_existed
         }
     except Exception as e:
         return {
@@ -296,17 +402,25 @@ async def create_multiple_directories(directories: List[str], base_path: str = "
     try:
         base_directory = get_directory(base_path)
         
+        # Drop repeated names and create shared parents once, up front, so the
+        # parallel workers don't each re-check the same intermediate folders
+        unique_dirs = list(dict.fromkeys(directories))
+        for parent in sorted({(base_directory / dir_path).parent for dir_path in unique_dirs}):
+            try:
+                parent.mkdir(parents=True, exist_ok=True)
+            except OSError:
+                pass  # Reported by the directory that needed it
+        
         def create_single_directory(dir_path):
             try:
                 target_dir = Path(dir_path)
                 full_path = base_directory / target_dir
-                full_path.mkdir(parents=True, exist_ok=True)
+                full_path.mkdir(exist_ok=True)
                 return {"success": True, "path": str(full_path)}
             except Exception as e:
                 return {"success": False, "path": dir_path, "error": str(e)}
         
-        operations = [(create_single_directory, (dir_path,), {}) for dir_path in directories]
-        results = await execute_operations(operations, execution_mode)
+        results = await run_io_parallel(create_single_directory, unique_dirs, execution_mode)
         
         created_dirs = []
         failed_dirs = []
@@ -332,27 +446,82 @@ async def create_multiple_directories(directories: List[str], base_path: str = "
             "base_path": base_path
         }
 
+def clone_or_copy2(src, dst, *, follow_symlinks=True):
+    """shutil.copy2 drop-in that first tries a copy-on-write clone of the file data"""
+    if CAN_REFLINK and (follow_symlinks or not os.path.islink(src)):
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+        # Same guard as copy2, checked before anything is opened for writing
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+        dst_dir = os.path.dirname(dst) or "."
+        try:
+            devices = (os.stat(src).st_dev, os.stat(dst_dir).st_dev)
+        except OSError:
+            # Let copy2 report the missing source or directory
+            devices = None
+        if devices is not None and devices not in _reflink_unsupported:
+            # Clone into a private temp file so a failed clone never touches an existing dst
+            fd, temp_path = tempfile.mkstemp(prefix=".folderly-", suffix=".tmp", dir=dst_dir)
+            try:
+                with open(src, 'rb') as fsrc, os.fdopen(fd, 'wb') as fdst:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                shutil.copystat(src, temp_path, follow_symlinks=follow_symlinks)
+                os.replace(temp_path, dst)
+                return dst
+            except OSError as e:
+                # Unsupported filesystem or different devices: remember it and do a regular byte copy
+                if e.errno in REFLINK_UNSUPPORTED_ERRNOS:
+                    _reflink_unsupported.add(devices)
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+    return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
 async def move_items_to_directory(items: list[Path], destination_dir: Path, execution_mode: str = "parallel") -> Dict[str, Any]:
     """Moves multiple items to a destination directory"""
     try:
+        # Work on plain strings: one fspath per item instead of repeated Path joins and str() calls
+        destination_root = os.fspath(destination_dir)
+        
         def move_single_item(item):
+            source = os.fspath(item)
             try:
-                if item.name.startswith('.'):
-                    return {"success": False, "item": str(item), "reason": "hidden file"}
-                
-                dest = destination_dir / item.name
-                shutil.move(str(item), str(dest))
-                return {"success": True, "item": str(item), "destination": str(dest)}
+                dest = os.path.join(destination_root, item.name)
+                try:
+                    # A plain rename is one syscall when the name is free and on the same device
+                    if os.path.lexists(dest):
+                        raise FileExistsError(dest)
+                    os.replace(source, dest)
+                except FileExistsError:
+                    # An existing destination: keep shutil.move's merge/overwrite semantics
+                    shutil.move(source, dest, copy_function=clone_or_copy2)
+                except OSError as e:
+                    # Only a cross-device rename needs shutil's copy+delete; any other
+                    # error (missing source, ...) would just fail again inside shutil.move
+                    if e.errno != errno.EXDEV:
+                        raise
+                    shutil.move(source, dest, copy_function=clone_or_copy2)
+                return {"success": True, "item": source, "destination": dest}
             except PermissionError:
-                return {"success": False, "item": str(item), "reason": "file in use"}
+                return {"success": False, "item": source, "reason": "file in use"}
             except Exception as e:
-                return {"success": False, "item": str(item), "reason": str(e)}
+                return {"success": False, "item": source, "reason": str(e)}
         
-        operations = [(move_single_item, (item,), {}) for item in items]
-        results = await execute_operations(operations, execution_mode)
+        # Hidden items are skipped up front so they never occupy a worker slot
+        movable_items = []
+        skipped_items = []
+        for item in items:
+            if item.name.startswith('.'):
+                skipped_items.append({"item": os.fspath(item), "reason": "hidden file"})
+            else:
+                movable_items.append(item)
+        
+        # Cross-device moves are copy streams that block on I/O, so give them their own wider pool
+        results = await run_io_parallel(move_single_item, movable_items, execution_mode)
         
         moved_items = []
-        skipped_items = []
         
         for result in results:
             if result["success"]:
@@ -379,20 +548,29 @@ async def create_numbered_files(base_name: str, count: int, extension: str, star
         if target_dir is None:
             target_dir = get_directory(custom_path=custom_path)
         
+        # The content prefix and target folder are the same for every file
+        target_root = str(target_dir)
+        content_prefix = f"This is {base_name} number "
+        prefix_bytes = content_prefix.encode('utf-8')
+        
         def create_single_file(file_number):
             try:
                 filename = f"{base_name}_{file_number}.{extension}"
-                file_path = target_dir / filename
+                file_path = os.path.join(target_root, filename)
+                number = str(file_number)
                 
-                content = f"This is {base_name} number {file_number}"
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                # Raw descriptor write: no text wrapper or buffer for a one-line file
+                fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.write(fd, prefix_bytes + number.encode('ascii'))
+                finally:
+                    os.close(fd)
                 
                 return {
                     "success": True,
                     "filename": filename,
-                    "path": str(file_path),
-                    "content_length": len(content)
+                    "path": file_path,
+                    "content_length": len(content_prefix) + len(number)
                 }
             except Exception as e:
                 return {
@@ -401,8 +579,8 @@ async def create_numbered_files(base_name: str, count: int, extension: str, star
                     "error": str(e)
                 }
         
-        operations = [(create_single_file, (i,), {}) for i in range(start_number, start_number + count)]
-        results = await execute_operations(operations, execution_mode)
+        # Each creation is an independent open/write/close, so overlap them on a pool sized to the batch
+        results = await run_io_parallel(create_single_file, range(start_number, start_number + count), execution_mode)
         
         created_files = []
         failed_files = []
@@ -442,8 +620,8 @@ async def delete_single_item(item_path: str) -> Dict[str, Any]:
 async def delete_multiple_items(item_paths: List[str], execution_mode: str = "parallel") -> Dict[str, Any]:
     """Deletes multiple files and directories"""
     try:
-        operations = [(_delete_item_internal, (item_path,), {}) for item_path in item_paths]
-        results = await execute_operations(operations, execution_mode)
+        # send2trash blocks, so run it on worker threads rather than on the event loop
+        results = await run_io_parallel(_trash_item, item_paths, execution_mode)
         
         deleted_items = []
         failed_items = []
@@ -481,17 +659,28 @@ async def delete_multiple_items(item_paths: List[str], execution_mode: str = "pa
 
 async def _delete_item_internal(item_path: str) -> Dict[str, Any]:
     """Internal helper function for deleting items"""
+    return await asyncio.to_thread(_trash_item, item_path)
+
+def _trash_item(item_path: str) -> Dict[str, Any]:
+    """Blocking half of _delete_item_internal: stats the item and sends it to the trash"""
     try:
         path = Path(item_path)
         
-        if not path.exists():
+        # One stat answers exists/is_file/is_dir, and is taken before the item is gone
+        try:
+            mode = path.stat().st_mode
+        except FileNotFoundError:
             return {
                 "success": False,
                 "error": f"Item does not exist: {item_path}",
                 "item_path": item_path
             }
         
-        if not path.is_file() and not path.is_dir():
+        if stat.S_ISREG(mode):
+            item_type = "file"
+        elif stat.S_ISDIR(mode):
+            item_type = "directory"
+        else:
             return {
                 "success": False,
                 "error": f"Item is not a file or directory: {item_path}",
@@ -503,7 +692,7 @@ async def _delete_item_internal(item_path: str) -> Dict[str, Any]:
         return {
             "success": True,
             "deleted_item": item_path,
-            "item_type": "file" if path.is_file() else "directory",
+            "item_type": item_type,
             "deletion_method": "sent_to_trash"
         }
         
@@ -578,18 +767,25 @@ def list_nested_folders_tree(target_dir: str = None, max_depth: int = 3, custom_
                 "target_dir": target_dir
             }
         
-        def build_tree(path: Path, depth: int = 0, is_last: bool = False, prefix: str = "") -> str:
+        # Folders are counted while the tree is built, not by re-scanning its text
+        folder_count = 0
+        
+        def build_tree(path: str, depth: int = 0, is_last: bool = False, prefix: str = "") -> str:
+            nonlocal folder_count
             if depth > max_depth:
                 return ""
             
             try:
-                items = sorted([item for item in path.iterdir() if item.is_dir()], key=lambda x: x.name.lower())
+                # DirEntry.is_dir() uses the type from the directory read, no extra stat per child
+                with os.scandir(path) as entries:
+                    items = sorted([entry for entry in entries if entry.is_dir()], key=lambda x: x.name.lower())
             except PermissionError:
                 return f"{prefix}└── [Access Denied]\n"
             
             if not items:
                 return ""
             
+            folder_count += len(items)
             tree_lines = []
             for i, item in enumerate(items):
                 is_last_item = i == len(items) - 1
@@ -599,13 +795,13 @@ def list_nested_folders_tree(target_dir: str = None, max_depth: int = 3, custom_
                 tree_lines.append(f"{prefix}{connector} {item.name}/")
                 
                 child_prefix = prefix + line_prefix
-                child_tree = build_tree(item, depth + 1, is_last_item, child_prefix)
+                child_tree = build_tree(item.path, depth + 1, is_last_item, child_prefix)
                 if child_tree:
                     tree_lines.append(child_tree)
             
             return "\n".join(tree_lines)
         
-        tree_structure = build_tree(search_dir)
+        tree_structure = build_tree(target_dir)
         
         if not tree_structure:
             return {
@@ -617,13 +813,12 @@ def list_nested_folders_tree(target_dir: str = None, max_depth: int = 3, custom_
             }
         
         full_tree = f"{search_dir.name}/\n{tree_structure}"
-        folder_count = len([line for line in full_tree.split('\n') if line.strip().endswith('/')])
         
         return {
             "success": True,
             "target_dir": target_dir,
             "tree_structure": full_tree,
-            "total_folders": folder_count,
+            "total_folders": folder_count + 1,  # The root line counts as well
             "max_depth": max_depth
         }
         
@@ -646,19 +841,15 @@ async def count_files_by_extension(folder_name: str = None, custom_path: str = N
                 "folder_name": folder_name or TARGET_FOLDER
             }
         
-        all_files = [f for f in target_dir.iterdir() if f.is_file()]
-        
-        extension_counts = {}
-        total_files = len(all_files)
-        
-        for file_path in all_files:
-            ext = file_path.suffix.lower()
-            if ext:
-                extension_counts[ext] = extension_counts.get(ext, 0) + 1
-            else:
-                extension_counts["no_extension"] = extension_counts.get("no_extension", 0) + 1
+        # Hash-count extensions in the same pass as the directory read
+        with os.scandir(target_dir) as entries:
+            extension_counts = Counter(
+                os.path.splitext(entry.name)[1].lower() or "no_extension"
+                for entry in entries if entry.is_file()
+            )
         
-        sorted_extensions = sorted(extension_counts.items(), key=lambda x: x[1], reverse=True)
+        total_files = sum(extension_counts.values())
+        sorted_extensions = extension_counts.most_common()
         
         return {
             "success": True,
@@ -687,14 +878,15 @@ async def get_file_type_statistics(folder_name: str = None, custom_path: str = N
                 "folder_name": folder_name or TARGET_FOLDER
             }
         
-        all_files = [f for f in target_dir.iterdir() if f.is_file()]
+        with os.scandir(target_dir) as entries:
+            all_files = [entry.name for entry in entries if entry.is_file()]
         
         type_counts = {file_type: 0 for file_type in FILE_TYPE_MAPPINGS.keys()}
         type_counts["other"] = 0
         total_files = len(all_files)
         
-        for file_path in all_files:
-            ext = file_path.suffix.lower()
+        for file_name in all_files:
+            ext = os.path.splitext(file_name)[1].lower()
             categorized = False
             
             for file_type, extensions in FILE_TYPE_MAPPINGS.items():
@@ -727,25 +919,28 @@ async def get_file_type_statistics(folder_name: str = None, custom_path: str = N
 async def copy_multiple_items(items: list[Path], destination_dir: Path, execution_mode: str = "parallel") -> Dict[str, Any]:
     """Copies multiple items to a destination directory"""
     try:
+        destination_root = os.fspath(destination_dir)
+        
         def copy_single_item(item):
+            source = os.fspath(item)
+            name = item.name
             try:
-                if item.name.startswith('.'):
-                    return {"success": False, "item": str(item), "reason": "hidden file"}
+                if name.startswith('.'):
+                    return {"success": False, "item": source, "reason": "hidden file"}
                 
-                dest = destination_dir / item.name
+                dest = os.path.join(destination_root, name)
                 if item.is_file():
-                    shutil.copy2(str(item), str(dest))
+                    clone_or_copy2(source, dest)
                 else:
-                    shutil.copytree(str(item), str(dest), dirs_exist_ok=True)
+                    shutil.copytree(source, dest, copy_function=clone_or_copy2, dirs_exist_ok=True)
                 
-                return {"success": True, "item": str(item), "destination": str(dest)}
+                return {"success": True, "item": source, "destination": dest}
             except PermissionError:
-                return {"success": False, "item": str(item), "reason": "permission denied"}
+                return {"success": False, "item": source, "reason": "permission denied"}
             except Exception as e:
-                return {"success": False, "item": str(item), "reason": str(e)}
+                return {"success": False, "item": source, "reason": str(e)}
         
-        operations = [(copy_single_item, (item,), {}) for item in items]
-        results = await execute_operations(operations, execution_mode)
+        results = await run_io_parallel(copy_single_item, items, execution_mode)
         
         copied_items = []
         failed_items = []
@@ -792,8 +987,7 @@ async def rename_multiple_items(items: list[tuple[Path, str]], execution_mode: s
             except Exception as e:
                 return {"success": False, "item": str(old_path), "reason": str(e)}
         
-        operations = [(rename_single_item, (item_tuple,), {}) for item_tuple in items]
-        results = await execute_operations(operations, execution_mode)
+        results = await run_io_parallel(rename_single_item, items, execution_mode)
         
         renamed_items = []
         failed_items = []
@@ -827,21 +1021,17 @@ def is_file_type_match(filename: str, file_type: str) -> bool:
     
     return any(filename.lower().endswith(ext) for ext in FILE_TYPE_MAPPINGS[file_type])
 
-def is_in_date_range(modified_date: str, date_range: tuple) -> bool:
-    """Check if modified date is within the specified range"""
+def date_range_to_mtime_bounds(date_range):
+    """Turn a date_range (days ago, or a (start, end) datetime pair) into (min, max) mtimes, or None"""
     try:
         if isinstance(date_range, int):
-            days_ago = date_range
-            cutoff = datetime.now() - timedelta(days=days_ago)
-            file_date = datetime.fromisoformat(modified_date)
-            return file_date >= cutoff
+            return (time.time() - date_range * SECONDS_PER_DAY, float("inf"))
         elif isinstance(date_range, tuple) and len(date_range) == 2:
             start_date, end_date = date_range
-            file_date = datetime.fromisoformat(modified_date)
-            return start_date <= file_date <= end_date
-        return True
-    except:
-        return True
+            return (start_date.timestamp(), end_date.timestamp())
+        return None
+    except Exception:
+        return None
 
 def is_in_size_range(size: int, size_range: tuple) -> bool:
     """Check if file size is within the specified range"""
@@ -956,6 +1146,11 @@ def summarize_paths(paths):
 
 async def discover_user_paths() -> Dict[str, Any]:
     """Main function to discover all user folder paths with analysis"""
+    # Discovery is all blocking directory reads, so keep it off the event loop
+    return await asyncio.to_thread(_discover_user_paths_sync)
+
+def _discover_user_paths_sync() -> Dict[str, Any]:
+    """Blocking half of discover_user_paths"""
     try:
         # Find candidate base paths
         base_paths = find_candidate_paths()
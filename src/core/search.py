@@ -1,18 +1,33 @@
+import os
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
-def filter_by_name(items: List[Path], name_substring: str) -> Dict[str, Any]:
+def build_name_index(items: List[Path]) -> List[Tuple[str, Path]]:
+    """
+    Pairs each item with its casefolded name so repeated searches skip re-lowering.
+    Args:
+        items (List[Path]): Paths or DirEntries to index.
+    Returns:
+        List[Tuple[str, Path]]: (casefolded name, item) pairs in the original order.
+    """
+    return [(item.name.casefold(), item) for item in items]
+
+def filter_by_name(items: List[Path], name_substring: str, name_index: List[Tuple[str, Path]] = None) -> Dict[str, Any]:
     """
     Returns items whose name contains the given substring (case-insensitive).
     Args:
         items (List[Path]): List of Path objects to filter.
         name_substring (str): Substring to search for in the item names.
+        name_index (List[Tuple[str, Path]]): Optional index from build_name_index for the same items.
     Returns:
         Dict[str, Any]: Dictionary with success status, results, and metadata.
     """
     try:
-        norm_sub = name_substring.lower().strip()
-        results = [item for item in items if norm_sub in item.name.lower()]
+        if name_index is None:
+            name_index = build_name_index(items)
+        norm_sub = name_substring.casefold().strip()
+        results = [item for name, item in name_index if norm_sub in name]
         
         return {
             "success": True,
@@ -26,18 +41,47 @@ def filter_by_name(items: List[Path], name_substring: str) -> Dict[str, Any]:
             "error": str(e)
         }
 
+def find_duplicates_by_name(items: List[Path], name_index: List[Tuple[str, Path]] = None) -> Dict[str, Any]:
+    """
+    Groups items that share a name once case is ignored, in a single pass.
+    Args:
+        items (List[Path]): Paths or DirEntries, usually from several folders.
+        name_index (List[Tuple[str, Path]]): Optional index from build_name_index for the same items.
+    Returns:
+        Dict[str, Any]: Dictionary with success status and the paths grouped per duplicated name.
+    """
+    try:
+        if name_index is None:
+            name_index = build_name_index(items)
+        paths_by_name = defaultdict(list)
+        for name, item in name_index:
+            paths_by_name[name].append(os.fspath(item))
+        duplicates = {name: paths for name, paths in paths_by_name.items() if len(paths) > 1}
+        
+        return {
+            "success": True,
+            "duplicates": duplicates,
+            "total_groups": len(duplicates)
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 if __name__ == "__main__":
-    from .core import list_directory_items
-    all_items = list_directory_items()
+    from .core import get_directory, get_visible_items
+    all_items = get_visible_items(get_directory())
+    name_index = build_name_index(all_items)
     search_term = input("Enter a file or folder name (or part of it) to search for: ").strip()
     if search_term:
-        result = filter_by_name(all_items, search_term)
+        result = filter_by_name(all_items, search_term, name_index)
         if result["success"]:
             matches = result["results"]
             if matches:
                 print(f"\nFound {result['total_found']} matches:")
                 for match in matches:
-                    print(match)
+                    print(match.path)
             else:
                 print("No files or folders found matching your search.")
         else:
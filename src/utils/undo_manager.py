@@ -1,6 +1,7 @@
 from .utils import read_operation_metadata, delete_operation_metadata
 from .backup import restore_file_or_folder, delete_backup_file_or_folder
 import os
+import shutil
 from datetime import datetime
 
 def undo_last_operation(expected_type=None):
@@ -36,7 +37,6 @@ def undo_last_operation(expected_type=None):
             if os.path.exists(item['destination_path']):
                 try:
                     if os.path.isdir(item['destination_path']):
-                        import shutil
                         shutil.rmtree(item['destination_path'])
                     else:
                         os.remove(item['destination_path'])
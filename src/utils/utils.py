@@ -2,6 +2,11 @@ import os
 import tempfile
 import json
 
+try:
+    import orjson #faster json, used when installed
+except ImportError:
+    orjson=None
+
 #Getting the path for the temp json file
 def get_temp_json_path():
     temp_dir=tempfile.gettempdir()
@@ -16,13 +21,20 @@ def get_backup_dir():
 
 def write_operation_metadata(data):
     path=get_temp_json_path()
+    if orjson:
+        with open(path,'wb') as f:
+            f.write(orjson.dumps(data)) #compact bytes, no indentation
+        return
     with open(path,'w',encoding='utf-8') as f: #opening the file for writing
-        json.dump(data,f,indent=2) #dump is the funcion that writes the python dict to a file in json format
+        json.dump(data,f,separators=(',',':')) #dump is the funcion that writes the python dict to a file in json format
 
 def read_operation_metadata():
     path=get_temp_json_path()
     if not os.path.exists(path):
         return None
+    if orjson:
+        with open(path,'rb') as f:
+            return orjson.loads(f.read())
     with open(path,'r',encoding='utf-8') as f:
         return json.load(f)
     
@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai import ai_integration
+from src.ai.response_cache import ResponseCache
+
+
+def text_chunk(content, finish_reason=None):
+    delta = SimpleNamespace(content=content, tool_calls=None)
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=None)
+
+
+def tool_call_chunk(index, call_id, name, arguments, finish_reason=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    delta = SimpleNamespace(
+        content=None, tool_calls=[SimpleNamespace(index=index, id=call_id, function=function)]
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta, finish_reason=finish_reason)], usage=None)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            if self.closed:
+                return
+            yield chunk
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    """Answers each streamed completion with the next scripted list of chunks (or raises it)
+
+    Non-streamed requests are history summaries and get the next scripted summary text.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+        self.summaries = []
+        self.summary_requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        if not kwargs.get("stream"):
+            self.summary_requests.append(kwargs)
+            message = SimpleNamespace(content=self.summaries.pop(0))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        self.requests.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return FakeStream(response)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def chat(tmp_path, monkeypatch):
+    """Runs chat_with_ai against scripted input lines and a fake OpenAI client"""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(ai_integration, "HISTORY_PATH", tmp_path / ".folderly" / "history.json")
+    monkeypatch.setattr(ai_integration, "RESPONSE_CACHE_PATH", tmp_path / ".folderly" / "response_cache.json")
+    monkeypatch.setattr(ai_integration, "response_cache", ResponseCache())
+    monkeypatch.setattr(ai_integration, "_read_cache", {"entries": {}, "generation": 0})
+    monkeypatch.setattr(ai_integration, "read_queued_lines", lambda: [])
+    (tmp_path / "Desktop").mkdir()
+
+    client = FakeClient()
+    monkeypatch.setattr(ai_integration, "_get_client", lambda: client)
+
+    def run(lines):
+        inputs = iter(lines)
+
+        async def read_line(prompt):
+            return next(inputs)
+
+        monkeypatch.setattr(ai_integration, "read_line_in_thread", read_line)
+        asyncio.run(ai_integration.chat_with_ai())
+        return client
+
+    run.client = client
+    run.history_path = ai_integration.HISTORY_PATH
+    return run
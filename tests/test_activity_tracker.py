@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from folderly import activity_tracker
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def moved_event(src_path, dest_path):
+    events = pytest.importorskip("watchdog.events")
+    return events.FileMovedEvent(str(src_path), str(dest_path))
+
+
+@pytest.fixture
+def tracker(tmp_path, monkeypatch):
+    monkeypatch.setattr(activity_tracker, "LOG_FILE", str(tmp_path / "activities.jsonl"))
+    monkeypatch.setattr(activity_tracker, "LEGACY_LOG_FILE", str(tmp_path / "activities.json"))
+    return activity_tracker.FolderlyActivityTracker(str(tmp_path))
+
+
+def test_move_from_ignored_name_is_not_logged(tracker, tmp_path):
+    tracker._record_moved(moved_event(tmp_path / "report.pdf.tmp", tmp_path / "report.pdf"))
+    assert tracker.activities == []
+
+
+def test_move_to_ignored_name_is_not_logged(tracker, tmp_path):
+    tracker._record_moved(moved_event(tmp_path / "a.pdf", tmp_path / "a.log"))
+    assert tracker.activities == []
+
+
+def test_move_between_tracked_names_is_logged(tracker, tmp_path):
+    tracker._record_moved(moved_event(tmp_path / "a.pdf", tmp_path / "b.pdf"))
+    assert [activity["action"] for activity in tracker.activities] == ["file_moved"]
+    assert tracker.activities[0]["details"]["new_name"] == "b.pdf"
+
+
+def test_tracker_works_without_watchdog(tmp_path):
+    # A None entry in sys.modules makes "import watchdog" fail like a base install
+    script = (
+        "import sys; sys.modules['watchdog'] = None\n"
+        "from folderly.ai_activity_integration import get_background_tracker\n"
+        "tracker = get_background_tracker()\n"
+        "tracker.add_activity('file_created', {'filename': 'a.txt'})\n"
+        "print(tracker.get_activity_summary())\n"
+    )
+    env = dict(os.environ, HOME=str(tmp_path), PYTHONPATH=str(PROJECT_ROOT))
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert "'files_created': 1" in result.stdout
+
+
+def test_trackers_start_no_worker_until_an_event_arrives(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(activity_tracker.atexit, "register", registered.append)
+    monkeypatch.setattr(activity_tracker, "LOG_FILE", str(tmp_path / "activities.jsonl"))
+    monkeypatch.setattr(activity_tracker, "LEGACY_LOG_FILE", str(tmp_path / "activities.json"))
+    threads = threading.active_count()
+
+    trackers = [activity_tracker.FolderlyActivityTracker(str(tmp_path)) for _ in range(5)]
+
+    assert threading.active_count() == threads
+    assert registered == []
+    assert all(tracker._worker is None for tracker in trackers)
+
+
+def test_worker_starts_once_and_stop_unregisters_it(tracker, tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(activity_tracker.atexit, "register", registered.append)
+    monkeypatch.setattr(activity_tracker.atexit, "unregister", registered.remove)
+
+    tracker._enqueue(tracker._record_moved, moved_event(tmp_path / "a.pdf", tmp_path / "b.pdf"))
+    worker = tracker._worker
+    tracker._enqueue(tracker._record_moved, moved_event(tmp_path / "b.pdf", tmp_path / "c.pdf"))
+    assert tracker._worker is worker
+    assert registered == [tracker.stop]
+
+    tracker.stop()
+
+    assert not worker.is_alive()
+    assert registered == []
+    assert [activity["action"] for activity in tracker.activities] == ["file_moved", "file_moved"]
+
+
+def test_summary_and_cleanup_use_the_time_index(tracker):
+    for action in ("file_created", "file_created", "file_deleted"):
+        tracker.add_activity(action, {"filename": "a.txt"})
+    tracker.activities[0]["_ts"] = tracker._ts_index[0] = 0.0
+
+    summary = tracker.get_activity_summary()
+    assert summary["files_created"] == 1
+    assert summary["files_deleted"] == 1
+
+    tracker.clear_old_activities()
+    assert len(tracker.activities) == len(tracker._ts_index) == 2
+
+
+def test_modified_burst_is_logged_once(tracker, tmp_path):
+    events = pytest.importorskip("watchdog.events")
+    path = str(tmp_path / "notes.txt")
+    for _ in range(20):
+        tracker.on_modified(events.FileModifiedEvent(path))
+    tracker.on_modified(events.FileModifiedEvent(str(tmp_path / "other.txt")))
+    tracker.stop()
+
+    assert [activity["details"]["filename"] for activity in tracker.activities] == ["notes.txt", "other.txt"]
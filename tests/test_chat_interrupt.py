@@ -0,0 +1,42 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.skipif(os.name == "nt", reason="SIGINT cannot be sent to a console process this way")
+def test_ctrl_c_at_prompt_ends_chat_cleanly(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path), OPENAI_API_KEY="test-key", PYTHONPATH=str(PROJECT_ROOT))
+    process = subprocess.Popen(
+        [sys.executable, "-u", "-c", "from src.ai.ai_integration import main_sync; main_sync()"],
+        cwd=tmp_path,
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        # Wait until the chat is blocked at the prompt, with stdin still open
+        output = b""
+        deadline = time.monotonic() + 20
+        while "You:".encode() not in output and time.monotonic() < deadline:
+            output += process.stdout.read1(4096)
+        assert "You:".encode() in output
+
+        process.send_signal(signal.SIGINT)
+        rest, _ = process.communicate(timeout=20)
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+    text = (output + rest).decode()
+    assert process.returncode == 0, text
+    assert "See you later" in text
+    assert "Traceback" not in text
+    assert (tmp_path / ".folderly" / "history.json").exists()
@@ -0,0 +1,66 @@
+import errno
+import shutil
+
+import pytest
+
+from src.core import core
+
+
+class FailingIoctl:
+    """Stands in for fcntl on a filesystem that cannot clone"""
+
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+
+    def ioctl(self, fd, request, arg):
+        self.calls += 1
+        raise OSError(self.error, "clone failed")
+
+
+@pytest.fixture
+def no_reflink(monkeypatch):
+    def install(error):
+        fake = FailingIoctl(error)
+        monkeypatch.setattr(core, "fcntl", fake)
+        monkeypatch.setattr(core, "CAN_REFLINK", True)
+        monkeypatch.setattr(core, "_reflink_unsupported", set())
+        return fake
+
+    return install
+
+
+def test_copy_keeps_contents(tmp_path):
+    src = tmp_path / "a.txt"
+    src.write_text("hello")
+    assert core.clone_or_copy2(str(src), str(tmp_path / "b.txt")) == str(tmp_path / "b.txt")
+    assert (tmp_path / "b.txt").read_text() == "hello"
+
+
+def test_copy_into_itself_raises(tmp_path):
+    src = tmp_path / "a.txt"
+    src.write_text("hello")
+    with pytest.raises(shutil.SameFileError):
+        core.clone_or_copy2(str(src), str(tmp_path))
+    assert src.read_text() == "hello"
+
+
+@pytest.mark.parametrize("error", [errno.EOPNOTSUPP, errno.EXDEV])
+def test_unsupported_clone_is_tried_once_per_device(tmp_path, no_reflink, error):
+    fake = no_reflink(error)
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.txt").write_text(name)
+        core.clone_or_copy2(str(tmp_path / f"{name}.txt"), str(tmp_path / f"{name}.copy"))
+
+    assert fake.calls == 1
+    assert [(tmp_path / f"{name}.copy").read_text() for name in ("a", "b", "c")] == ["a", "b", "c"]
+    assert list(tmp_path.glob(".folderly-*")) == []
+
+
+def test_transient_clone_failure_is_retried(tmp_path, no_reflink):
+    fake = no_reflink(errno.EIO)
+    for name in ("a", "b"):
+        (tmp_path / f"{name}.txt").write_text(name)
+        core.clone_or_copy2(str(tmp_path / f"{name}.txt"), str(tmp_path / f"{name}.copy"))
+
+    assert fake.calls == 2
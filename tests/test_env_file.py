@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from src.ai.ai_integration import _read_env_file
+
+KEYS = ("PLAIN", "SPACED", "DOUBLE", "SINGLE", "HASH_QUOTED", "COMMENTED", "GLUED", "EXPORTED",
+        "EMPTY", "UNCLOSED", "TRAILING", "PRESET")
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    for key in KEYS:
+        monkeypatch.delenv(key, raising=False)
+
+    def load(text):
+        path = tmp_path / ".env"
+        path.write_text(text, encoding="utf-8")
+        _read_env_file(path)
+        return {key: os.environ[key] for key in KEYS if key in os.environ}
+
+    return load
+
+
+def test_plain_and_quoted_values(env):
+    values = env(
+        "PLAIN=abc\n"
+        "SPACED = some value \n"
+        'DOUBLE="two words"\n'
+        "SINGLE='it''s'\n"
+        'UNCLOSED="no end\n'
+        'TRAILING="kept" ignored\n'
+    )
+    assert values == {
+        "PLAIN": "abc", "SPACED": "some value", "DOUBLE": "two words",
+        "SINGLE": "it", "UNCLOSED": "no end", "TRAILING": "kept",
+    }
+
+
+def test_hash_in_quotes_versus_inline_comments(env):
+    values = env(
+        'HASH_QUOTED="sk-#abc # not a comment"\n'
+        "COMMENTED=sk-abc   # rotated monthly\n"
+        "GLUED=sk-#abc\n"
+    )
+    assert values == {"HASH_QUOTED": "sk-#abc # not a comment", "COMMENTED": "sk-abc", "GLUED": "sk-#abc"}
+
+
+def test_export_prefix_blank_comment_and_malformed_lines(env):
+    values = env(
+        "\n"
+        "   \n"
+        "# PLAIN=commented out\n"
+        "export EXPORTED=yes\n"
+        "not a setting\n"
+        "=no key\n"
+        "EMPTY=\n"
+    )
+    assert values == {"EXPORTED": "yes", "EMPTY": ""}
+
+
+def test_existing_variables_are_not_overridden(env, monkeypatch):
+    monkeypatch.setenv("PRESET", "from shell")
+    assert env("PRESET=from file\nPLAIN=x\n") == {"PRESET": "from shell", "PLAIN": "x"}
@@ -0,0 +1,47 @@
+import asyncio
+import os
+
+from src.ai import ai_integration
+from src.core.core import get_visible_items
+from src.core.search import build_name_index, find_duplicates_by_name
+
+
+def make_files(folder, *names):
+    folder.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (folder / name).write_text(name)
+
+
+def test_groups_names_across_folders_ignoring_case(tmp_path):
+    make_files(tmp_path / "a", "Report.pdf", "notes.txt", ".hidden")
+    make_files(tmp_path / "b", "report.PDF", "other.txt", ".hidden")
+    items = get_visible_items(tmp_path / "a") + get_visible_items(tmp_path / "b")
+
+    result = find_duplicates_by_name(items)
+
+    assert result["success"]
+    assert result["total_groups"] == 1
+    assert sorted(result["duplicates"]["report.pdf"]) == [
+        os.path.join(tmp_path, "a", "Report.pdf"), os.path.join(tmp_path, "b", "report.PDF")
+    ]
+
+
+def test_reuses_a_prebuilt_name_index(tmp_path):
+    make_files(tmp_path / "a", "x.txt")
+    make_files(tmp_path / "b", "X.txt")
+    items = get_visible_items(tmp_path / "a") + get_visible_items(tmp_path / "b")
+
+    assert find_duplicates_by_name(items, build_name_index(items))["total_groups"] == 1
+
+
+def test_tool_compares_the_default_folders(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(ai_integration, "_read_cache", {"entries": {}, "generation": 0})
+    make_files(tmp_path / "Desktop", "invoice.pdf", "todo.txt")
+    make_files(tmp_path / "Downloads", "invoice.pdf")
+
+    result = asyncio.run(ai_integration.execute_function("find_duplicates_by_name", {}))
+
+    assert result["success"]
+    assert list(result["duplicates"]) == ["invoice.pdf"]
+    assert "find_duplicates_by_name" in ai_integration.READ_ONLY_FUNCTIONS
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from src.ai import ai_integration
+from src.ai.ai_integration import load_history, save_history, trim_history
+from src.ai.prompts import load_history_summary_message
+
+SYSTEM = {"role": "system", "content": "system prompt"}
+SUMMARY = load_history_summary_message("earlier the user listed their Desktop")
+
+
+def tool_turn(number, rounds=1):
+    """A user message answered after `rounds` rounds of two tool calls each"""
+    messages = [{"role": "user", "content": f"request {number}"}]
+    for round_number in range(rounds):
+        ids = [f"call_{number}_{round_number}_{index}" for index in range(2)]
+        messages.append({
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {"id": call_id, "type": "function", "function": {"name": "list_directory_items", "arguments": "{}"}}
+                for call_id in ids
+            ]
+        })
+        messages.extend({"role": "tool", "tool_call_id": call_id, "content": "{}"} for call_id in ids)
+    messages.append({"role": "assistant", "content": f"answer {number}"})
+    return messages
+
+
+def assert_rounds_complete(window):
+    """Every tool message follows its call, and every call has its result"""
+    pending = set()
+    for message in window:
+        if message["role"] == "tool":
+            assert message["tool_call_id"] in pending, window
+            pending.discard(message["tool_call_id"])
+        else:
+            assert not pending, window
+            pending = {call["id"] for call in message.get("tool_calls", [])}
+    assert not pending
+
+
+@pytest.mark.parametrize("head", [[SYSTEM], [SYSTEM, SUMMARY]])
+@pytest.mark.parametrize("limit", range(1, 20))
+def test_trimmed_window_never_starts_mid_round(monkeypatch, head, limit):
+    monkeypatch.setattr(ai_integration, "MAX_HISTORY_MESSAGES", limit)
+    history = list(head)
+    for number in range(4):
+        history += tool_turn(number, rounds=number % 3)
+
+    trimmed = trim_history(history)
+
+    assert trimmed[:len(head)] == head
+    window = trimmed[len(head):]
+    assert len(window) <= limit
+    assert not window or window[0]["role"] in ("user", "assistant")
+    assert_rounds_complete(window)
+
+
+@pytest.mark.parametrize("limit", range(1, 6))
+@pytest.mark.parametrize("rounds", [1, 2])
+def test_single_long_turn_keeps_no_dangling_tool_messages(monkeypatch, limit, rounds):
+    monkeypatch.setattr(ai_integration, "MAX_HISTORY_MESSAGES", limit)
+    # A turn interrupted after its last tool results, with more messages than the window holds
+    history = [SYSTEM] + tool_turn(0, rounds=rounds)[:-1]
+
+    trimmed = trim_history(history)
+
+    assert trimmed[0] == SYSTEM
+    assert_rounds_complete(trimmed[1:])
+
+
+def test_short_history_is_left_alone():
+    history = [SYSTEM, SUMMARY] + tool_turn(0)
+    assert trim_history(history) is history
+
+
+@pytest.fixture
+def history_path(tmp_path, monkeypatch):
+    path = tmp_path / ".folderly" / "history.json"
+    monkeypatch.setattr(ai_integration, "HISTORY_PATH", path)
+    return path
+
+
+def test_saved_history_loads_under_the_current_system_prompt(history_path):
+    save_history([{"role": "system", "content": "an old system prompt"}, SUMMARY] + tool_turn(0))
+
+    loaded = load_history()
+
+    assert loaded[0] == {"role": "system", "content": ai_integration.SYSTEM_PROMPT}
+    assert loaded[1:] == [SUMMARY] + tool_turn(0)
+
+
+def test_loaded_history_is_trimmed(history_path, monkeypatch):
+    monkeypatch.setattr(ai_integration, "MAX_HISTORY_MESSAGES", 4)
+    save_history([SYSTEM] + tool_turn(0) + tool_turn(1) + tool_turn(2, rounds=0))
+
+    loaded = load_history()
+
+    assert [message.get("content") for message in loaded[1:]] == ["request 2", "answer 2"]
+
+
+@pytest.mark.parametrize("content", [b"", b"{not json", b'{"role": "user"}', b'["text"]'])
+def test_unreadable_history_starts_fresh(history_path, content):
+    history_path.parent.mkdir(parents=True)
+    history_path.write_bytes(content)
+    assert load_history() == [{"role": "system", "content": ai_integration.SYSTEM_PROMPT}]
+
+
+def test_missing_history_starts_fresh(history_path):
+    assert load_history() == [{"role": "system", "content": ai_integration.SYSTEM_PROMPT}]
+    save_history([SYSTEM])
+    assert json.loads(history_path.read_text()) == [SYSTEM]
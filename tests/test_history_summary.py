@@ -0,0 +1,33 @@
+import json
+
+from src.ai import ai_integration
+from src.ai.prompts import is_history_summary_message
+
+from tests.conftest import text_chunk, tool_call_chunk
+
+
+def write_long_history(path, pairs):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    history = []
+    for number in range(pairs):
+        history.append({"role": "user", "content": f"old question {number}"})
+        history.append({"role": "assistant", "content": f"old answer {number}"})
+    path.write_text(json.dumps(history))
+
+
+def test_failed_turn_still_folds_its_summary(chat):
+    write_long_history(chat.history_path, ai_integration.MAX_HISTORY_MESSAGES)
+    client = chat.client
+    # The first turn trims the history, runs a tool, then loses the connection
+    client.responses.append([tool_call_chunk(0, "call_1", "list_directory_items", "{}", "tool_calls")])
+    client.responses.append(ConnectionError("connection reset"))
+    client.responses.append([text_chunk("Hello again.", "stop")])
+    client.summaries.extend(["first summary", "second summary"])
+
+    chat(["hello there", "hello once more", "bye"])
+
+    # The next turn trims again; its summary builds on the first instead of orphaning it
+    assert "Previous summary: first summary" in client.summary_requests[1]["messages"][1]["content"]
+    saved = json.loads(chat.history_path.read_text())
+    assert is_history_summary_message(saved[1])
+    assert saved[1]["content"].endswith("second summary")
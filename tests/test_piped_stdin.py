@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from src.ai.ai_integration import PipedStdin
+
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    for fd in (read_fd, write_fd):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def test_lines_queued_behind_the_prompt_are_batched_while_the_pipe_is_open(pipe):
+    read_fd, write_fd = pipe
+    reader = PipedStdin(read_fd)
+    os.write(write_fd, b"list desktop\ncount files\n\nshow downloads\n")
+
+    assert reader.readline() == "list desktop"
+    # The writer keeps the pipe open; the queued lines must still be seen
+    assert reader.queued_lines(4) == ["count files", "show downloads"]
+    assert reader.queued_lines(4) == []
+
+
+def test_queued_lines_respects_the_limit(pipe):
+    read_fd, write_fd = pipe
+    reader = PipedStdin(read_fd)
+    os.write(write_fd, b"a\nb\nc\nd\n")
+
+    assert reader.queued_lines(2) == ["a", "b"]
+    assert reader.readline() == "c"
+
+
+def test_partial_line_waits_for_its_newline(pipe):
+    read_fd, write_fd = pipe
+    reader = PipedStdin(read_fd)
+    os.write(write_fd, b"done\nhalf a li")
+
+    assert reader.queued_lines(4) == ["done"]
+    os.write(write_fd, b"ne\n")
+    assert reader.readline() == "half a line"
+
+
+def test_unterminated_last_line_then_eof(pipe):
+    read_fd, write_fd = pipe
+    reader = PipedStdin(read_fd)
+    os.write(write_fd, b"bye")
+    os.close(write_fd)
+
+    assert reader.readline() == "bye"
+    with pytest.raises(EOFError):
+        reader.readline()
@@ -0,0 +1,63 @@
+from src.ai.response_cache import ResponseCache
+
+from tests.conftest import text_chunk, tool_call_chunk
+
+LIST_CALL = [{"name": "list_directory_items", "arguments": "{}"}]
+
+
+def test_same_prompt_hits_after_other_turns():
+    cache = ResponseCache()
+    cache.put("List my Desktop!", LIST_CALL)
+    assert cache.get("list my desktop") == LIST_CALL
+
+
+def test_mutating_and_context_dependent_prompts_are_not_cached():
+    cache = ResponseCache()
+    for prompt in ("delete old files", "sort it by date", "open that folder", "show them again"):
+        cache.put(prompt, LIST_CALL)
+        assert cache.get(prompt) is None
+
+
+def test_working_directory_is_part_of_the_key(tmp_path, monkeypatch):
+    cache = ResponseCache()
+    cache.put("list my desktop", LIST_CALL)
+    monkeypatch.chdir(tmp_path)
+    assert cache.get("list my desktop") is None
+
+
+def test_saved_entries_hit_in_a_new_session(tmp_path):
+    cache = ResponseCache()
+    cache.put("list my desktop", LIST_CALL)
+    cache.save(tmp_path / "cache.json")
+
+    restored = ResponseCache()
+    restored.load(tmp_path / "cache.json")
+    assert restored.get("list my desktop") == LIST_CALL
+
+
+def test_repeated_prompt_skips_the_routing_completion(chat):
+    client = chat.client
+    for turn in range(3):
+        if turn == 0:
+            # Only the first turn asks the model which tool to call
+            client.responses.append([tool_call_chunk(0, "call_1", "list_directory_items", "{}", "tool_calls")])
+        client.responses.append([text_chunk("Your desktop is empty.", "stop")])
+
+    chat(["list my desktop", "list my desktop", "list my desktop", "bye"])
+
+    assert client.responses == []
+    assert len(client.requests) == 4
+
+
+def test_mutation_clears_cached_routing(chat):
+    client = chat.client
+    client.responses.append([tool_call_chunk(0, "call_1", "list_directory_items", "{}", "tool_calls")])
+    client.responses.append([text_chunk("Empty.", "stop")])
+    client.responses.append([tool_call_chunk(0, "call_2", "create_directory", '{"target_dir": "new"}', "tool_calls")])
+    # The second listing has to be routed by the model again
+    client.responses.append([tool_call_chunk(0, "call_3", "list_directory_items", "{}", "tool_calls")])
+    client.responses.append([text_chunk("One folder.", "stop")])
+
+    chat(["list my desktop", "make a folder called new", "list my desktop", "bye"])
+
+    assert client.responses == []
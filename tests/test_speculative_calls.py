@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from src.ai import ai_integration
+from src.ai.ai_integration import JsonPrefixChecker, discard_speculative_calls, start_speculative_call
+
+
+def feed_all(*fragments):
+    checker = JsonPrefixChecker()
+    return [checker.feed(fragment) for fragment in fragments], checker
+
+
+def test_incomplete_object_stays_valid():
+    results, checker = feed_all('{"folder_name": ', '"Desk')
+    assert results == [True, True]
+    assert not checker.finished
+
+
+def test_complete_object_finishes():
+    results, checker = feed_all('{"items": [1, {"a": 2}', "]}  ")
+    assert results == [True, True]
+    assert checker.finished
+
+
+def test_brackets_and_escaped_quotes_inside_strings_are_text():
+    # The escape is split across fragments, as the stream may deliver it
+    results, checker = feed_all('{"pattern": "a}\\', '"]{', '"}')
+    assert results == [True, True, True]
+    assert checker.finished
+
+
+@pytest.mark.parametrize("text", ['["a"]', '{"a": 1]', '{"a": 1} {', 'null'])
+def test_invalid_prefixes_are_rejected(text):
+    assert JsonPrefixChecker().feed(text) is False
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    calls = []
+
+    async def execute_function(name, args):
+        calls.append((name, args))
+        return {"success": True}
+
+    monkeypatch.setattr(ai_integration, "execute_function", execute_function)
+    return calls
+
+
+def streamed_call(name, *fragments):
+    return {"id": "call_1", "name": [name], "arguments": list(fragments)}
+
+
+def test_read_only_call_starts_once_its_arguments_are_complete(executed):
+    async def scenario():
+        tool_call = streamed_call("list_directory_items", '{"folder_name": "Desk')
+        start_speculative_call(tool_call)
+        assert "speculative" not in tool_call
+
+        tool_call["arguments"].append('top"}')
+        start_speculative_call(tool_call)
+        args, task = tool_call["speculative"]
+        await task
+        return args
+
+    assert asyncio.run(scenario()) == {"folder_name": "Desktop"}
+    assert executed == [("list_directory_items", {"folder_name": "Desktop"})]
+
+
+def test_unbalanced_arguments_ending_in_a_brace_do_not_start(executed):
+    async def scenario():
+        tool_call = streamed_call("list_directory_items", '{"a": {"b": 1}')
+        start_speculative_call(tool_call)
+        return tool_call
+
+    assert "speculative" not in asyncio.run(scenario())
+    assert executed == []
+
+
+@pytest.mark.parametrize("name, arguments", [
+    ("delete_single_item", '{"item_path": "a.txt"}'),
+    ("move_items_to_directory", '{"items": ["a.txt"], "destination_dir": "b"}'),
+    ("create_directory", '{"target_dir": "new"}'),
+])
+def test_mutating_calls_never_run_speculatively(executed, name, arguments):
+    async def scenario():
+        tool_call = streamed_call(name, arguments)
+        start_speculative_call(tool_call)
+        await asyncio.sleep(0)
+        return tool_call
+
+    assert "speculative" not in asyncio.run(scenario())
+    assert executed == []
+
+
+def test_discarded_speculative_call_is_cancelled(monkeypatch):
+    async def execute_function(name, args):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(ai_integration, "execute_function", execute_function)
+
+    async def scenario():
+        tool_call = streamed_call("list_directory_items", "{}")
+        start_speculative_call(tool_call)
+        task = tool_call["speculative"][1]
+        discard_speculative_calls([tool_call])
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return tool_call
+
+    assert "speculative" not in asyncio.run(scenario())